@@ -0,0 +1,41 @@
+"""Benchmarks of aggregation, normalization and the discount processor."""
+from __future__ import annotations
+
+import pytest
+
+from core.aggregator import DEFAULT_MAX_WORKERS, _normalize_item, aggregate
+from plugins.logic_discount import DiscountPlugin
+from synthetic import SyntheticSource, make_items, make_rows
+
+
+def _discount(percent: int) -> DiscountPlugin:
+    plugin = DiscountPlugin()
+    plugin.update_settings({"adjustment_percent": percent})
+    return plugin
+
+
+@pytest.mark.parametrize("workers", [1, DEFAULT_MAX_WORKERS])
+def bench_aggregate(bench, size, workers):
+    # Half clean items (pass-through path), half raw dicts (full normalization)
+    sources = [
+        SyntheticSource("clean", size // 2),
+        SyntheticSource("raw", size - size // 2, raw=True),
+    ]
+    items, errors = bench(lambda: aggregate(sources, [_discount(-10)], max_workers=workers))
+    invalid = len(range(0, size - size // 2, 50))  # see make_rows()
+    assert len(items) == size - invalid
+    assert len(errors) == invalid
+
+
+def bench_normalize_item(bench, size):
+    rows = make_rows(size)
+    results = bench(lambda: [_normalize_item(row, "synthetic") for row in rows])
+    assert len(results) == size
+
+
+@pytest.mark.parametrize("percent", [-10, 20])
+def bench_discount_process(bench, size, percent):
+    items = make_items(size)
+    plugin = _discount(percent)
+    result = bench(lambda: list(plugin.process(items)))
+    assert len(result) == size
@@ -0,0 +1,91 @@
+"""
+Memory and construction-time benchmark for ServiceItem.
+
+Compares the previous plain frozen dataclass with the current slotted ServiceItem
+(regular constructor and the ServiceItem.create fast path).
+
+    python benchmarks/bench_models.py [--sizes 10000 100000 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.models import ServiceItem  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LegacyServiceItem:
+    """ServiceItem as it was before slots and interning."""
+    name: str
+    price: float
+    category: Optional[str]
+    source: str
+    url: Optional[str] = None
+
+
+CATEGORIES = ["Техническое обслуживание", "Шиномонтаж", "Кузовной ремонт", "Диагностика", "Электрика"]
+
+
+def _raw_rows(count: int) -> Iterator[tuple[str, float, str, str, str]]:
+    # Repeated strings are built as separate objects, the way an HTML parser returns them.
+    # Rows are generated lazily, so the memory figure includes every string an item keeps alive.
+    for i in range(count):
+        yield (
+            f"Замена масла в двигателе #{i}",
+            float(500 + i % 9000),
+            "".join(CATEGORIES[i % len(CATEGORIES)]),
+            "".join(["auto-motul", ".ru"]),
+            "".join(["https://auto-motul.ru", "/price/"]),
+        )
+
+
+def _measure(factory: Callable[..., object], size: int) -> tuple[float, int]:
+    # Timing and memory are separate passes: tracemalloc slows allocation down considerably
+    rows = list(_raw_rows(size))
+    gc.collect()
+    start = time.perf_counter()
+    items = [factory(*row) for row in rows]
+    elapsed = time.perf_counter() - start
+    del items, rows
+
+    gc.collect()
+    tracemalloc.start()
+    items = [factory(*row) for row in _raw_rows(size)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return elapsed, current
+
+
+def run(sizes: list[int]) -> None:
+    variants: list[tuple[str, Callable[..., object]]] = [
+        ("legacy dataclass", LegacyServiceItem),
+        ("slotted __init__", ServiceItem),
+        ("ServiceItem.create", ServiceItem.create),
+    ]
+    print(f"{'items':>9}  {'variant':<20} {'time, s':>9} {'memory, MB':>11} {'B/item':>7}")
+    for size in sizes:
+        for label, factory in variants:
+            elapsed, memory = _measure(factory, size)
+            print(f"{size:>9}  {label:<20} {elapsed:>9.3f} {memory / 1e6:>11.1f} {memory / size:>7.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    run(args.sizes)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""
+Parse time and peak memory of the parser plugins: full page tree vs. restricted (SoupStrainer) parsing.
+
+By default the pages are generated to follow the markup of auto-motul.ru/price/ and magic-car24.ru
+(price blocks inside a large page with head, scripts, menus and other content).
+Saved copies of the real pages can be passed instead:
+
+    python benchmarks/bench_parsing.py [--automotul saved.html] [--magiccar saved.html] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+
+from plugins import parser_automotul, parser_magiccar  # noqa: E402
+
+FILLER_BLOCKS = 400
+
+
+def _page(body: str) -> str:
+    head = "".join(f"<script>var s{i} = {{a: {i}, b: '{'x' * 200}'}};</script>" for i in range(50))
+    head += "<style>" + ".c{color:red}" * 2000 + "</style>"
+    menu = "<ul class='menu'>" + "".join(f"<li><a href='/p{i}'>Пункт {i}</a></li>" for i in range(200)) + "</ul>"
+    filler = "".join(
+        f"<div class='block'><h2>Раздел {i}</h2><p>{'Текст о компании. ' * 20}</p>"
+        f"<img src='/img/{i}.jpg'><a href='/more/{i}'>Подробнее</a></div>"
+        for i in range(FILLER_BLOCKS)
+    )
+    return f"<html><head>{head}</head><body>{menu}{filler}{body}{filler}</body></html>"
+
+
+def automotul_page(categories: int = 30, services: int = 40) -> str:
+    body = "".join(
+        "<div class='price-list-category'>"
+        f"<h3 class='price-list-category__title'>Категория {c}</h3><ul>"
+        + "".join(
+            "<li class='service-list-dish'><div><div>"
+            f"Замена масла {c}-{s}</div><p>Описание работ</p></div>"
+            f"<div class='service-list-dish__price'>{500 + s * 10} руб.</div></li>"
+            for s in range(services)
+        )
+        + "</ul></div>"
+        for c in range(categories)
+    )
+    return _page(body)
+
+
+def magiccar_page(blocks: int = 20, services: int = 50) -> str:
+    body = "".join(
+        "<div class='t022__text'>"
+        + "".join(f"<p>Покраска детали {b}-{s} - от {1000 + s * 100} р</p>" for s in range(services))
+        + "</div>"
+        for b in range(blocks)
+    )
+    return _page(body)
+
+
+@contextmanager
+def _full_tree(module, strainer_name: str) -> Iterator[None]:
+    """Parses the whole page, as the plugins did before restricted parsing."""
+    strainer = getattr(module, strainer_name)
+    setattr(module, strainer_name, None)
+    try:
+        yield
+    finally:
+        setattr(module, strainer_name, strainer)
+
+
+def _measure(parse: Callable[[], list], repeat: int) -> tuple[float, float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = parse()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6, len(items)
+
+
+def run(automotul_html: str, magiccar_html: str, repeat: int) -> None:
+    automotul = parser_automotul.AutoMotulPlugin()
+    magiccar = parser_magiccar.MagicCarParser()
+    cases = [
+        ("auto-motul", parser_automotul, "PRICE_LIST_STRAINER",
+         lambda: automotul.parse(automotul_html, "https://auto-motul.ru/price/"), len(automotul_html)),
+        ("magic-car24", parser_magiccar, "PRICE_BLOCK_STRAINER",
+         lambda: magiccar.parse(magiccar_html, "https://magic-car24.ru/", "Прайс-лист"), len(magiccar_html)),
+    ]
+    print(f"{'page':<12} {'size, KB':>9} {'mode':<11} {'time, ms':>9} {'peak, MB':>9} {'items':>6}")
+    for label, module, strainer_name, parse, size in cases:
+        with _full_tree(module, strainer_name):
+            full = _measure(parse, repeat)
+        restricted = _measure(parse, repeat)
+        for mode, (elapsed, peak, count) in (("full tree", full), ("restricted", restricted)):
+            print(f"{label:<12} {size / 1024:>9.0f} {mode:<11} {elapsed * 1000:>9.1f} {peak:>9.1f} {count:>6}")
+        if full[2] != restricted[2]:
+            print(f"WARNING: {label}: item count differs between modes")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--automotul", type=Path, help="saved auto-motul.ru/price/ page")
+    parser.add_argument("--magiccar", type=Path, help="saved magic-car24.ru page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    automotul_html = args.automotul.read_text(encoding="utf-8") if args.automotul else automotul_page()
+    magiccar_html = args.magiccar.read_text(encoding="utf-8") if args.magiccar else magiccar_page()
+    run(automotul_html, magiccar_html, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""Benchmarks of the table model and the filtering/sorting proxy (offscreen Qt platform)."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QCoreApplication, Qt  # noqa: E402
+
+from core.models import ServiceItem  # noqa: E402
+from core.store import ServiceStore  # noqa: E402
+from synthetic import make_items  # noqa: E402
+from ui.proxy_model import SequentialHeaderProxyModel  # noqa: E402
+from ui.table_model import ServiceTableModel  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def items(size):
+    return make_items(size)
+
+
+def _models(items) -> tuple[ServiceTableModel, SequentialHeaderProxyModel]:
+    model = ServiceTableModel(ServiceStore(items))
+    proxy = SequentialHeaderProxyModel()
+    proxy.setSourceModel(model)
+    return model, proxy
+
+
+@pytest.mark.parametrize(
+    "search_text, min_price, max_price",
+    [("", 1000.0, 5000.0), ("масл", 0.0, 999999999.0), ("колодок 1", 2000.0, 8000.0)],
+    ids=["price", "search", "search+price"],
+)
+def bench_proxy_filter(bench, qapp, items, search_text, min_price, max_price):
+    model, proxy = _models(items)
+    # Alternates with the unfiltered view, so that every round changes the visible rows
+    def run():
+        proxy.apply_filter(proxy.compute_filter(search_text, min_price, max_price))
+        accepted = proxy.rowCount()
+        proxy.apply_filter(proxy.compute_filter("", 0.0, 999999999.0))
+        return accepted
+
+    accepted = bench(run)
+    assert 0 < accepted <= len(items)
+
+
+@pytest.mark.parametrize("column", [0, 1, 2, 3], ids=["name", "category", "price", "source"])
+def bench_proxy_sort(bench, qapp, items, column):
+    # A fresh model per round: the first sort of a column builds its permutation
+    def setup():
+        return _models(items)
+
+    def run(model, proxy):
+        proxy.sort(column, Qt.SortOrder.AscendingOrder)
+        proxy.sort(column, Qt.SortOrder.DescendingOrder)
+        return proxy
+
+    proxy = bench(run, setup)
+    assert proxy.rowCount() == len(items)
+
+
+def bench_table_model_data(bench, qapp, items):
+    # Every cell once, as a full repaint/auto-size pass asks for it; display strings are built on first use
+    def setup():
+        return (ServiceTableModel(ServiceStore(items)),)
+
+    def run(model):
+        index = model.index
+        data = model.data
+        columns = range(model.columnCount())
+        for row in range(model.rowCount()):
+            for column in columns:
+                data(index(row, column), Qt.ItemDataRole.DisplayRole)
+        return model
+
+    model = bench(run, setup)
+    assert model.rowCount() == len(items)
+
+
+@pytest.mark.parametrize("mode", ["diff", "reset"])
+def bench_table_refresh(bench, qapp, items, mode):
+    # A refresh in which 1% of the prices moved, sorted by price: keyed diff against a model reset
+    refreshed = [
+        ServiceItem.create(item.name, item.price + 1.0, item.category, item.source, item.url) if i % 100 == 0 else item
+        for i, item in enumerate(items)
+    ]
+
+    def setup():
+        model, proxy = _models(items)
+        proxy.sort(2, Qt.SortOrder.AscendingOrder)
+        return model, proxy
+
+    def run(model, proxy):
+        if mode == "diff":
+            model.update_items(refreshed)
+        else:
+            model.set_items(ServiceStore(refreshed))
+        return proxy
+
+    proxy = bench(run, setup)
+    assert proxy.rowCount() == len(items)
@@ -0,0 +1,171 @@
+"""
+Benchmark suite for the core data path, run with pytest (offline, synthetic data only):
+
+    pytest benchmarks                                  # 1k, 10k and 100k items
+    pytest benchmarks --bench-sizes 1000 1000000       # up to a million items
+    pytest benchmarks --bench-json baseline.json       # where to write the results
+    pytest benchmarks --bench-compare baseline.json    # fail if a median got slower
+
+Every benchmark takes a `size` (number of items, from --bench-sizes) and times a callable
+through the `bench` fixture. Results are written as JSON (benchmarks/results.json by default);
+a saved file can be given to --bench-compare on a later run.
+"""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+# Qt benchmarks run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))  # `plugins` package
+sys.path.insert(0, str(Path(__file__).resolve().parent))  # `synthetic`
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_JSON = Path(__file__).resolve().parent / "results.json"
+# Every benchmark runs at least MIN_ROUNDS times and is repeated until it took MIN_TIME seconds
+MIN_ROUNDS = 3
+MAX_ROUNDS = 50
+MIN_TIME = 0.5
+
+_results_key = pytest.StashKey[dict]()
+_regressions_key = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="item counts to run with")
+    group.addoption("--bench-rounds", type=int, default=MIN_ROUNDS, help="minimum rounds per benchmark")
+    group.addoption("--bench-json", type=Path, default=DEFAULT_JSON, help="file to write the results to")
+    group.addoption("--bench-compare", type=Path, help="earlier results to compare with")
+    group.addoption(
+        "--bench-tolerance", type=float, default=0.25, help="allowed slowdown of the median (0.25 = 25%%)"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[_results_key] = {}
+    config.stash[_regressions_key] = []
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "size" in metafunc.fixturenames:
+        metafunc.parametrize("size", metafunc.config.getoption("bench_sizes"))
+
+
+class Bench:
+    """Times a callable over several rounds and records min/median/mean under the test id."""
+
+    def __init__(self, name: str, size: int | None, min_rounds: int, results: dict[str, Any]) -> None:
+        self._name = name
+        self._size = size
+        self._min_rounds = min_rounds
+        self._results = results
+
+    def __call__(self, func: Callable[..., Any], setup: Callable[[], tuple] | None = None) -> Any:
+        """
+        Runs `func(*setup())` (setup is not timed) and returns the result of the last round.
+        Garbage collection is done between rounds, not inside them.
+        """
+        times: list[float] = []
+        result = None
+        while len(times) < self._min_rounds or (sum(times) < MIN_TIME and len(times) < MAX_ROUNDS):
+            args = setup() if setup is not None else ()
+            result = None
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                result = func(*args)
+                times.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+        self._results[self._name] = {
+            "size": self._size,
+            "rounds": len(times),
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+        }
+        return result
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    size = request.node.callspec.params.get("size") if hasattr(request.node, "callspec") else None
+    return Bench(
+        request.node.nodeid,
+        size,
+        request.config.getoption("bench_rounds"),
+        request.config.stash[_results_key],
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    config = session.config
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+
+    path: Path = config.getoption("bench_json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "results": results,
+            },
+            f,
+            indent=1,
+        )
+
+    baseline_file: Path | None = config.getoption("bench_compare")
+    if baseline_file is None:
+        return
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+    limit = 1.0 + config.getoption("bench_tolerance")
+    regressions = config.stash[_regressions_key]
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous and previous["median"] > 0:
+            ratio = result["median"] / previous["median"]
+            regressions.append((name, previous["median"], result["median"], ratio, ratio > limit))
+    if any(failed for *_, failed in regressions) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    results = config.stash.get(_results_key, {})
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in results.items():
+        terminalreporter.write_line(
+            f"{result['median'] * 1000:>11.2f} ms  (min {result['min'] * 1000:.2f}, {result['rounds']} rounds)  {name}"
+        )
+    terminalreporter.write_line(f"results written to {config.getoption('bench_json')}")
+
+    regressions = config.stash.get(_regressions_key, [])
+    if regressions:
+        terminalreporter.section("compared with baseline")
+        for name, before, after, ratio, failed in regressions:
+            mark = "SLOWER" if failed else ""
+            terminalreporter.write_line(
+                f"{ratio:>6.2f}x  {before * 1000:>10.2f} -> {after * 1000:>10.2f} ms  {mark:<6} {name}"
+            )
@@ -0,0 +1,52 @@
+"""Synthetic services and Source plugins for the benchmark suite (no network, deterministic)."""
+from __future__ import annotations
+
+import zlib
+
+from core.models import ServiceItem
+from core.plugin_base import PluginBase
+
+CATEGORIES = ["Техническое обслуживание", "Шиномонтаж", "Кузовной ремонт", "Диагностика", "Электрика"]
+OPERATIONS = ["Замена масла", "Замена колодок", "Регулировка фар", "Покраска бампера", "Балансировка колёс"]
+
+
+def make_items(count: int, source: str = "synthetic") -> list[ServiceItem]:
+    """Clean items, as a well-behaved parser returns them."""
+    return [
+        ServiceItem.create(
+            f"{OPERATIONS[i % len(OPERATIONS)]} {i // len(OPERATIONS)}",
+            float(500 + (i * 7919) % 9000),
+            CATEGORIES[i % len(CATEGORIES)],
+            source,
+            f"https://example.com/price/{i % 100}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_rows(count: int) -> list[dict[str, object]]:
+    """Raw dict rows that need normalization (padded strings, string prices, every 50th row invalid)."""
+    rows: list[dict[str, object]] = []
+    for i in range(count):
+        rows.append({
+            "name": f"  {OPERATIONS[i % len(OPERATIONS)]} {i // len(OPERATIONS)} " if i % 50 else " ",
+            "price": str(500 + (i * 7919) % 9000),
+            "category": f"{CATEGORIES[i % len(CATEGORIES)]} ",
+            "url": f"https://example.com/price/{i % 100}",
+        })
+    return rows
+
+
+class SyntheticSource(PluginBase):
+    """Source returning pre-built rows, so that a benchmark measures aggregation and not row creation."""
+
+    plugin_type = "Source"
+
+    def __init__(self, name: str, count: int, raw: bool = False) -> None:
+        super().__init__()
+        self.id = f"00000000-0000-0000-0000-{zlib.crc32(name.encode()):012d}"
+        self.name = name
+        self._rows: list = make_rows(count) if raw else make_items(count, name)
+
+    def load(self):
+        return self._rows
@@ -45,7 +45,7 @@ class DiscountPlugin(PluginBase):
                 
             new_name = f"{item.name} {suffix}"
             
-            yield ServiceItem(
+            yield ServiceItem.create(
                 name=new_name,
                 price=new_price,
                 category=item.category,
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import requests
-from bs4 import BeautifulSoup
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
 
 from core.plugin_base import PluginBase
 from core.models import ServiceItem
 
+# Only the price categories are built into a tree, the rest of the page is skipped while parsing
+PRICE_LIST_STRAINER = SoupStrainer("div", class_="price-list-category")
+PRICE_RE = re.compile(r"(\d+([.,]\d+)?)")
+
 
 class AutoMotulPlugin(PluginBase):
     id = "8E90A1D0-9EAA-4511-832F-ACC715F55740"
@@ -18,7 +23,8 @@ class AutoMotulPlugin(PluginBase):
     
     settings_schema = {
         "url": {"type": "str", "label": "URL источника", "default": "https://auto-motul.ru/price/"},
-        "timeout": {"type": "int", "label": "Таймаут (сек)", "default": 15}
+        "timeout": {"type": "int", "label": "Таймаут (сек)", "default": 15},
+        "refresh_interval": {"type": "int", "label": "Автообновление (мин, 0 - выкл.)", "default": 60}
     }
 
     def load(self):
@@ -29,12 +35,15 @@ class AutoMotulPlugin(PluginBase):
         # (some corporate proxies or specific setups), verify=False might be needed debugging.
         # For public sites, verify=True is standard.
         try:
-            response = requests.get(url, timeout=timeout)
+            response = self.http.get(url, timeout=timeout)
             response.raise_for_status()
         except Exception as e:
             raise RuntimeError(f"Network error: {e}")
 
-        soup = BeautifulSoup(response.content, "html.parser")
+        return self.parse(response.content, url)
+
+    def parse(self, markup: bytes | str, url: str) -> list[ServiceItem]:
+        soup = BeautifulSoup(markup, "html.parser", parse_only=PRICE_LIST_STRAINER)
         items = []
 
         # Find all category blocks
@@ -73,7 +82,7 @@ class AutoMotulPlugin(PluginBase):
 
                 # Only add if price is valid
                 if price_val is not None:
-                    items.append(ServiceItem(
+                    items.append(ServiceItem.create(
                         name=name,
                         price=price_val,
                         category=category_name,
@@ -93,8 +102,7 @@ class AutoMotulPlugin(PluginBase):
         # Given "300 руб.", let's just strip non-digit chars but keep separators?
         
         # Better approach: find the first number.
-        import re
-        match = re.search(r"(\d+([.,]\d+)?)", text)
+        match = PRICE_RE.search(text)
         if match:
             num_str = match.group(1).replace(",", ".")
             try:
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import re
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from core.plugin_base import PluginBase
 from core.models import ServiceItem
 
+# The prices are located in a specific block with class 't022__text', nothing else is parsed
+PRICE_BLOCK_STRAINER = SoupStrainer("div", class_="t022__text")
+
+# Regex to find "Service - from Price" pattern
+# Example: "Замена порога кузова - от 22 000р"
+# OR: "Покраска капота от - 18 000р"
+# Covers both " - от " and " от - "
+SERVICE_PRICE_RE = re.compile(r'(.*?)\s*[\-–—]?\s*от\s*[\-–—]?\s*([\d\s]+)р', re.IGNORECASE)
+
 
 class MagicCarParser(PluginBase):
     id = "550e8400-e29b-41d4-a716-446655449999"
@@ -26,6 +34,11 @@ class MagicCarParser(PluginBase):
             "type": "str",
             "label": "Категория по умолчанию",
             "default": "Прайс-лист"
+        },
+        "refresh_interval": {
+            "type": "int",
+            "label": "Автообновление (мин, 0 - выкл.)",
+            "default": 60
         }
     }
 
@@ -34,7 +47,7 @@ class MagicCarParser(PluginBase):
         default_category = self.settings.get("default_category", "Прайс-лист")
         
         try:
-            response = requests.get(url, timeout=10)
+            response = self.http.get(url, timeout=10)
             response.raise_for_status()
             response.encoding = 'utf-8'
         except Exception as e:
@@ -42,10 +55,12 @@ class MagicCarParser(PluginBase):
             print(f"Error fetching {url}: {e}")
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return self.parse(response.text, url, default_category)
+
+    def parse(self, markup: str, url: str, default_category: str) -> list[ServiceItem]:
+        soup = BeautifulSoup(markup, 'html.parser', parse_only=PRICE_BLOCK_STRAINER)
         items = []
 
-        # The prices are located in a specific block with class 't022__text'
         price_blocks = soup.find_all('div', class_='t022__text')
 
         for block in price_blocks:
@@ -55,12 +70,7 @@ class MagicCarParser(PluginBase):
                 if not text:
                     continue
 
-                # Regex to find "Service - from Price" pattern
-                # Example: "Замена порога кузова - от 22 000р"
-                # OR: "Покраска капота от - 18 000р"
-                
-                # Covers both " - от " and " от - "
-                match = re.search(r'(.*?)\s*[\-–—]?\s*от\s*[\-–—]?\s*([\d\s]+)р', text, re.IGNORECASE)
+                match = SERVICE_PRICE_RE.search(text)
 
                 if match:
                     name = match.group(1).strip()
@@ -71,7 +81,7 @@ class MagicCarParser(PluginBase):
                     except ValueError:
                         continue
                         
-                    items.append(ServiceItem(
+                    items.append(ServiceItem.create(
                         name=name,
                         price=price,
                         category=default_category,
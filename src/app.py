@@ -47,18 +47,30 @@ except ImportError:
         sys.modules["ui"] = src.ui
         
         # Also need submodules for direct 'from core.aggregator' imports inside ui
-        from src.core import aggregator, plugin_loader, license_manager, models, plugin_base
+        from src.core import aggregator, plugin_loader, license_manager, models, plugin_base, http_cache, pipeline, store, history, search_index, export, scheduler, metrics, profiling
         sys.modules["core.aggregator"] = aggregator
+        sys.modules["core.http_cache"] = http_cache
+        sys.modules["core.pipeline"] = pipeline
+        sys.modules["core.store"] = store
+        sys.modules["core.history"] = history
+        sys.modules["core.export"] = export
+        sys.modules["core.scheduler"] = scheduler
+        sys.modules["core.metrics"] = metrics
+        sys.modules["core.profiling"] = profiling
+        sys.modules["core.search_index"] = search_index
         sys.modules["core.plugin_loader"] = plugin_loader
         sys.modules["core.license_manager"] = license_manager
         sys.modules["core.models"] = models
         sys.modules["core.plugin_base"] = plugin_base
         
-        from src.ui import main_window, table_model, plugin_dialog, proxy_model
+        from src.ui import main_window, table_model, plugin_dialog, proxy_model, refresh_worker, filter_controller, diagnostics_dialog
         sys.modules["ui.main_window"] = main_window
         sys.modules["ui.table_model"] = table_model
         sys.modules["ui.plugin_dialog"] = plugin_dialog
         sys.modules["ui.proxy_model"] = proxy_model
+        sys.modules["ui.refresh_worker"] = refresh_worker
+        sys.modules["ui.filter_controller"] = filter_controller
+        sys.modules["ui.diagnostics_dialog"] = diagnostics_dialog
 
         from src.ui.main_window import MainWindow
     except ImportError:
@@ -0,0 +1,256 @@
+"""
+Headless mode: loads the plugins, runs the aggregation and writes the services as JSON,
+CSV or JSON Lines.
+
+    python -m src.cli --chain 58DD7F6F-B3F0-4332-8F43-BDF65F6DD974 --settings settings.json -o services.json
+
+CSV and JSON Lines are streamed: every source is written out as soon as it is loaded
+and processed, so the full result is never held in memory.
+
+With --serve [HOST:]PORT the result is kept in memory and served as a JSON API instead
+(see core.query_service), so several clients share one aggregation.
+
+With --from-history [SNAPSHOT_ID] nothing is aggregated: a snapshot of the price history
+(<data-dir>/history.sqlite3, the latest snapshot by default) is exported instead.
+
+The settings file maps plugin IDs to settings, e.g.
+{"58DD7F6F-B3F0-4332-8F43-BDF65F6DD974": {"adjustment_percent": -10}}.
+Only core modules are used, nothing here imports Qt.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+base_dir = Path(__file__).resolve().parent.parent
+
+# Plugins import `core.*`, so `src` itself has to be on the path (same as in app.py)
+current_file_dir = Path(__file__).parent
+if str(current_file_dir) not in sys.path:
+    sys.path.insert(0, str(current_file_dir))
+
+from core.aggregator import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PLUGIN_TIMEOUT,
+    DEFAULT_TOTAL_TIMEOUT,
+    aggregate,
+    aggregate_into,
+    aggregate_stream,
+)
+from core.export import EXPORT_FORMATS, ExportWriter, open_export
+from core.history import PriceHistory
+from core.http_cache import configure_default_cache
+from core.metrics import PluginMetrics, write_metrics
+from core.models import ServiceItem
+from core.plugin_base import PluginBase
+from core.plugin_loader import load_plugins
+from core.profiling import enable_from_environment, profile_run
+from core.query_service import Catalog, QueryServer
+from core.store import ServiceStore
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Aggregates services without the GUI.")
+    parser.add_argument("--plugins-dir", type=Path, default=base_dir / "plugins", help="plugin folder")
+    parser.add_argument(
+        "--data-dir", type=Path, default=base_dir / "data", help="folder for the plugin manifest and HTTP cache"
+    )
+    parser.add_argument("--chain", nargs="*", default=[], metavar="ID", help="processor plugin IDs, in order")
+    parser.add_argument("--settings", type=Path, help="JSON file: plugin ID -> settings")
+    parser.add_argument("-o", "--output", type=Path, help="output file (default: stdout)")
+    parser.add_argument(
+        "--format",
+        choices=("json", *EXPORT_FORMATS),
+        help="output format (default: from the output file extension, otherwise json)",
+    )
+    parser.add_argument("--metrics", type=Path, help="write per-plugin timings and counts to this JSON file")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--serve", metavar="[HOST:]PORT", help="serve the result over HTTP instead of writing it")
+    source.add_argument(
+        "--from-history",
+        nargs="?",
+        type=int,
+        const=0,
+        metavar="SNAPSHOT_ID",
+        help="export a price history snapshot (default: the latest) instead of aggregating",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="sources loaded in parallel")
+    parser.add_argument("--plugin-timeout", type=float, default=DEFAULT_PLUGIN_TIMEOUT, help="seconds per source")
+    parser.add_argument("--total-timeout", type=float, default=DEFAULT_TOTAL_TIMEOUT, help="seconds for all sources")
+    return parser
+
+
+def load_settings(settings_file: Path) -> dict[str, dict[str, Any]]:
+    with open(settings_file, "r", encoding="utf-8") as f:
+        settings = json.load(f)
+    if not isinstance(settings, dict) or not all(isinstance(v, dict) for v in settings.values()):
+        raise ValueError(f"{settings_file}: expected an object of plugin ID -> settings object")
+    return settings
+
+
+def resolve_chain(plugins: list[PluginBase], chain_ids: list[str]) -> list[PluginBase]:
+    by_id = {p.id.upper(): p for p in plugins}
+    processors = []
+    for pid in chain_ids:
+        plugin = by_id.get(pid.upper())
+        if plugin is None:
+            raise ValueError(f"Unknown plugin ID in the chain: {pid}")
+        processors.append(plugin)
+    return processors
+
+
+def write_items(items: list[ServiceItem], out: TextIO) -> None:
+    json.dump([asdict(item) for item in items], out, ensure_ascii=False, indent=1)
+    out.write("\n")
+
+
+def export_batches(
+    batches: Iterator[tuple[list[ServiceItem], list[str]]], writer: ExportWriter, errors: list[str]
+) -> int:
+    for items, batch_errors in batches:
+        writer.write(items)
+        errors.extend(batch_errors)
+    return writer.count
+
+
+def export_history(args: argparse.Namespace, fmt: str) -> int:
+    db_file = args.data_dir / "history.sqlite3"
+    if not db_file.exists():
+        print(f"Error: no price history in {args.data_dir}", file=sys.stderr)
+        return 2
+    history = PriceHistory(db_file)
+    try:
+        items = history.items(args.from_history or None)
+        if fmt == "json":
+            items = list(items)
+            count = len(items)
+            if args.output is None:
+                write_items(items, sys.stdout)
+            else:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    write_items(items, f)
+        elif args.output is None:
+            writer = ExportWriter(sys.stdout, fmt)
+            writer.write(items)
+            count = writer.count
+        else:
+            with open_export(args.output, fmt) as writer:
+                writer.write(items)
+            count = writer.count
+    except (sqlite3.Error, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        history.close()
+    print(f"{count} services", file=sys.stderr)
+    return 0
+
+
+def parse_address(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise ValueError(f"Invalid address for --serve: {value}") from None
+
+
+def serve(address: tuple[str, int], catalog: Catalog) -> None:
+    server = QueryServer(address, catalog)
+    host, port = server.server_address[:2]
+    print(f"Serving {len(catalog)} services on http://{host}:{port}/items", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def output_format(args: argparse.Namespace) -> str:
+    if args.format:
+        return args.format
+    suffix = args.output.suffix.lower().lstrip(".") if args.output is not None else ""
+    return suffix if suffix in EXPORT_FORMATS else "json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    fmt = output_format(args)
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    configure_default_cache(args.data_dir / "http_cache")
+    # With CARSERVICE_PROFILE set, the whole run is profiled into <data-dir>/profiles
+    enable_from_environment(args.data_dir / "profiles")
+    with profile_run("cli"):
+        return run(args, fmt)
+
+
+def run(args: argparse.Namespace, fmt: str) -> int:
+    if args.from_history is not None:
+        return export_history(args, fmt)
+
+    plugins, errors = load_plugins(args.plugins_dir, args.data_dir / "plugin_manifest.json")
+    try:
+        settings = load_settings(args.settings) if args.settings else {}
+        processors = resolve_chain(plugins, args.chain)
+        address = parse_address(args.serve) if args.serve else None
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    by_id = {p.id.upper(): p for p in plugins}
+    for pid, plugin_settings in settings.items():
+        plugin = by_id.get(pid.upper())
+        if plugin is None:
+            errors.append(f"Settings for unknown plugin ID {pid} ignored")
+        else:
+            plugin.update_settings(plugin_settings)
+
+    metrics: list[PluginMetrics] = []
+    options = dict(
+        max_workers=args.workers,
+        plugin_timeout=args.plugin_timeout,
+        total_timeout=args.total_timeout,
+        metrics=metrics,
+    )
+    if address is not None:
+        store = ServiceStore()
+        errors.extend(aggregate_into(store, plugins, processors, **options))
+        if args.metrics is not None:
+            write_metrics(args.metrics, metrics)
+        for error in errors:
+            print(error, file=sys.stderr)
+        serve(address, Catalog(store, errors))
+        return 0
+    if fmt == "json":
+        items, aggregate_errors = aggregate(plugins, processors, **options)
+        errors.extend(aggregate_errors)
+        count = len(items)
+        if args.output is None:
+            write_items(items, sys.stdout)
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                write_items(items, f)
+    else:
+        batches = aggregate_stream(plugins, processors, **options)
+        if args.output is None:
+            count = export_batches(batches, ExportWriter(sys.stdout, fmt), errors)
+        else:
+            with open_export(args.output, fmt) as writer:
+                count = export_batches(batches, writer, errors)
+
+    if args.metrics is not None:
+        write_metrics(args.metrics, metrics)
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(f"{count} services, {len(errors)} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,41 +1,344 @@
 from __future__ import annotations
 
-from typing import Iterable
+import math
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
 
+from .metrics import PluginMetrics, count_fetched_bytes
 from .models import ServiceItem
+from .pipeline import run_chain
 from .plugin_base import PluginBase
+from .profiling import profiled
+from .store import ServiceStore
 
+# Defaults used by the UI for the concurrent mode
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PLUGIN_TIMEOUT = 30.0
+DEFAULT_TOTAL_TIMEOUT = 60.0
 
-def aggregate(plugins: Iterable[PluginBase], processors: Iterable[PluginBase] | None = None) -> tuple[list[ServiceItem], list[str]]:
-    items: list[ServiceItem] = []
+_INF = math.inf
+
+# Running load() calls per plugin ID, kept until the call returns even if the aggregation
+# has given up on it (timeout): the pool thread goes on running it in the background
+_loading: dict[str, int] = {}
+_loading_lock = threading.Lock()
+
+
+def aggregate(
+    plugins: Iterable[PluginBase],
+    processors: Iterable[PluginBase] | None = None,
+    *,
+    max_workers: int = 1,
+    plugin_timeout: float | None = None,
+    total_timeout: float | None = None,
+    metrics: list[PluginMetrics] | None = None,
+) -> tuple[list[ServiceItem], list[str]]:
+    """
+    Loads items from all Source/Parser plugins and runs them through the processor chain.
+
+    With max_workers > 1 sources are loaded concurrently on a bounded thread pool.
+    plugin_timeout limits a single plugin (counted from the moment it starts running),
+    total_timeout limits the whole loading step. Results are always merged in plugin order.
+    With a `metrics` list given, a PluginMetrics record per source and processor is added to it.
+    """
     errors: list[str] = []
 
     # 1. Load data from Sources
-    for plugin in plugins:
-        if plugin.plugin_type != "Source" and plugin.plugin_type != "Parser":
-            continue
-            
+    sources = [p for p in plugins if _is_source(p)]
+    processors = list(processors or [])
+    source_records, chain_records = _metrics_records(sources, processors, metrics)
+    results = _load_sources(sources, max_workers, plugin_timeout, total_timeout, source_records)
+    for _, plugin_errors in results:
+        errors.extend(plugin_errors)
+
+    # 2. Apply Processing Chain: stages are fused, the only full list is the one built here
+    items = list(run_chain(_drain(results), processors, errors, chain_records))
+
+    return items, errors
+
+
+def aggregate_into(
+    store: ServiceStore,
+    plugins: Iterable[PluginBase],
+    processors: Iterable[PluginBase] | None = None,
+    *,
+    max_workers: int = 1,
+    plugin_timeout: float | None = None,
+    total_timeout: float | None = None,
+    metrics: list[PluginMetrics] | None = None,
+) -> list[str]:
+    """
+    Same as aggregate(), but the processed items are appended to a columnar ServiceStore
+    instead of being returned as a list of ServiceItem objects. Returns the errors.
+    """
+    errors: list[str] = []
+    sources = [p for p in plugins if _is_source(p)]
+    processors = list(processors or [])
+    source_records, chain_records = _metrics_records(sources, processors, metrics)
+    results = _load_sources(sources, max_workers, plugin_timeout, total_timeout, source_records)
+    for _, plugin_errors in results:
+        errors.extend(plugin_errors)
+
+    store.extend(run_chain(_drain(results), processors, errors, chain_records))
+    return errors
+
+
+def aggregate_stream(
+    plugins: Iterable[PluginBase],
+    processors: Iterable[PluginBase] | None = None,
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    plugin_timeout: float | None = None,
+    total_timeout: float | None = None,
+    metrics: list[PluginMetrics] | None = None,
+) -> Iterator[tuple[list[ServiceItem], list[str]]]:
+    """
+    Streaming variant of aggregate(): yields (items, errors) batches, one per source,
+    in the order the sources finish. Nothing is kept after a batch has been yielded.
+
+    The processor chain is applied to every batch separately, so processors must
+    work item by item (as all shipped Processor plugins do). Metrics records are added
+    up front and filled as the sources finish; processor records sum up all batches.
+    """
+    sources = [p for p in plugins if _is_source(p)]
+    chain = list(processors or [])
+    source_records, chain_records = _metrics_records(sources, chain, metrics)
+
+    for _, items, errors in _iter_sources(sources, max_workers, plugin_timeout, total_timeout, source_records):
+        if chain:
+            items = list(run_chain(items, chain, errors, chain_records))
+        yield items, errors
+
+
+def _drain(results: list[tuple[list[ServiceItem], list[str]]]) -> Iterator[ServiceItem]:
+    """Yields all loaded items in plugin order, releasing every source's list once consumed."""
+    for position in range(len(results)):
+        source_items = results[position][0]
+        results[position] = ([], [])
+        yield from source_items
+
+
+def _metrics_records(
+    sources: list[PluginBase],
+    processors: list[PluginBase],
+    metrics: list[PluginMetrics] | None,
+) -> tuple[list[PluginMetrics] | None, list[PluginMetrics] | None]:
+    """Adds a record per source and processor to `metrics` (if given) and returns both groups."""
+    if metrics is None:
+        return None, None
+    source_records = [PluginMetrics.for_plugin(p, "source") for p in sources]
+    chain_records = [PluginMetrics.for_plugin(p, "processor") for p in processors]
+    metrics.extend(source_records)
+    metrics.extend(chain_records)
+    return source_records, chain_records
+
+
+def _is_source(plugin: PluginBase) -> bool:
+    return plugin.plugin_type == "Source" or plugin.plugin_type == "Parser"
+
+
+def is_loading(plugin: PluginBase) -> bool:
+    """True while a load() of the plugin is running, including one that has timed out."""
+    with _loading_lock:
+        return plugin.id in _loading
+
+
+def _load_source(plugin: PluginBase, record: PluginMetrics | None = None) -> tuple[list[ServiceItem], list[str]]:
+    with _loading_lock:
+        _loading[plugin.id] = _loading.get(plugin.id, 0) + 1
+    try:
+        with profiled("load", plugin.name):
+            if record is not None:
+                return _load_source_measured(plugin, record)
+            items: list[ServiceItem] = []
+            errors: list[str] = []
+            try:
+                _normalize_batch(plugin.load(), plugin.name, items, errors)
+            except Exception as exc:  # pragma: no cover - defensive
+                errors.append(f"{plugin.name}: {exc}")
+            return items, errors
+    finally:
+        with _loading_lock:
+            if _loading[plugin.id] == 1:
+                del _loading[plugin.id]
+            else:
+                _loading[plugin.id] -= 1
+
+
+def _load_source_measured(plugin: PluginBase, record: PluginMetrics) -> tuple[list[ServiceItem], list[str]]:
+    items: list[ServiceItem] = []
+    errors: list[str] = []
+    started = time.perf_counter()
+    first_item_time: float | None = None
+    raw_count = 0
+    exception: str | None = None
+
+    def counted(raws: Iterable[object]) -> Iterator[object]:
+        nonlocal first_item_time, raw_count
+        for raw in raws:
+            if first_item_time is None:
+                first_item_time = time.perf_counter() - started
+            raw_count += 1
+            yield raw
+
+    with count_fetched_bytes() as fetched:
         try:
-            for raw in plugin.load():
-                item, item_errors = _normalize_item(raw, plugin.name)
-                if item is not None:
-                    items.append(item)
-                errors.extend(item_errors)
+            _normalize_batch(counted(plugin.load()), plugin.name, items, errors)
         except Exception as exc:  # pragma: no cover - defensive
             errors.append(f"{plugin.name}: {exc}")
+            exception = type(exc).__name__
 
-    # 2. Apply Processing Chain
-    if processors:
-        for proc in processors:
-            try:
-                 # consume the generator to create a list for the next step/final output
-                 items = list(proc.process(items))
-            except Exception as exc:
-                 errors.append(f"Processor {proc.name}: {exc}")
-
+    if record.exception is None:
+        # Otherwise the plugin has already been given up on (timeout), keep that outcome
+        record.wall_time = time.perf_counter() - started
+        record.first_item_time = first_item_time
+        record.items = len(items)
+        record.rejected = raw_count - len(items)
+        record.bytes_fetched = fetched.bytes
+        record.exception = exception
     return items, errors
 
 
+def _load_sources(
+    sources: list[PluginBase],
+    max_workers: int,
+    plugin_timeout: float | None,
+    total_timeout: float | None,
+    records: list[PluginMetrics] | None = None,
+) -> list[tuple[list[ServiceItem], list[str]]]:
+    """Returns (items, errors) per source, in the same order as `sources`."""
+    results: list[tuple[list[ServiceItem], list[str]]] = [([], []) for _ in sources]
+    for position, items, errors in _iter_sources(sources, max_workers, plugin_timeout, total_timeout, records):
+        results[position] = (items, errors)
+    return results
+
+
+def _iter_sources(
+    sources: list[PluginBase],
+    max_workers: int,
+    plugin_timeout: float | None,
+    total_timeout: float | None,
+    records: list[PluginMetrics] | None = None,
+) -> Iterator[tuple[int, list[ServiceItem], list[str]]]:
+    """
+    Yields (position, items, errors) for every source as soon as it is finished (or has expired).
+    `records` are the metrics records of the sources, by position.
+    """
+    if max_workers <= 1 and plugin_timeout is None and total_timeout is None:
+        for position, plugin in enumerate(sources):
+            yield (position, *_load_source(plugin, records[position] if records else None))
+        return
+
+    if not sources:
+        return
+
+    started: dict[int, float] = {}
+    lock = threading.Lock()
+
+    def run(position: int) -> tuple[list[ServiceItem], list[str]]:
+        with lock:
+            started[position] = time.monotonic()
+        return _load_source(sources[position], records[position] if records else None)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(sources))),
+        thread_name_prefix="aggregate",
+    )
+    try:
+        pending: dict[Future, int] = {executor.submit(run, i): i for i in range(len(sources))}
+        total_deadline = time.monotonic() + total_timeout if total_timeout is not None else None
+
+        while pending:
+            now = time.monotonic()
+
+            # Expire plugins that have been running for too long
+            if plugin_timeout is not None:
+                with lock:
+                    expired = [
+                        f for f, i in pending.items()
+                        if i in started and now - started[i] >= plugin_timeout
+                    ]
+                for future in expired:
+                    position = pending.pop(future)
+                    future.cancel()
+                    _record_timeout(records, position, plugin_timeout)
+                    yield position, [], [f"{sources[position].name}: timed out after {plugin_timeout:g} s"]
+                if not pending:
+                    break
+
+            if total_deadline is not None and now >= total_deadline:
+                for future, position in sorted(pending.items(), key=lambda p: p[1]):
+                    future.cancel()
+                    with lock:
+                        elapsed = now - started[position] if position in started else 0.0
+                    _record_timeout(records, position, elapsed)
+                    yield position, [], [f"{sources[position].name}: refresh deadline of {total_timeout:g} s exceeded"]
+                break
+
+            # Sleep until something completes or the nearest deadline comes up
+            wake_at: list[float] = []
+            if total_deadline is not None:
+                wake_at.append(total_deadline)
+            if plugin_timeout is not None:
+                with lock:
+                    wake_at.extend(started[i] + plugin_timeout for i in pending.values() if i in started)
+                # Queued plugins have no start time yet, poll so they get their deadline once started
+                if len(wake_at) < len(pending) + (total_deadline is not None):
+                    wake_at.append(now + 0.1)
+            timeout = max(0.0, min(wake_at) - now) if wake_at else None
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: pending[f]):
+                position = pending.pop(future)
+                yield (position, *future.result())
+    finally:
+        # Do not block on plugins that overran their deadline; their results are discarded
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _record_timeout(records: list[PluginMetrics] | None, position: int, elapsed: float) -> None:
+    if records:
+        record = records[position]
+        record.wall_time = elapsed
+        record.exception = "TimeoutError"
+
+
+def _normalize_batch(raws: Iterable[object], source: str, items: list[ServiceItem], errors: list[str]) -> None:
+    """
+    Normalizes a whole plugin output into `items`, collecting problems into `errors`.
+
+    ServiceItems that are already clean (stripped non-empty name, valid float price,
+    stripped category or None) and already carry the plugin's source are passed through as is;
+    clean items with another source are copied with it (items are shared, never changed in place).
+    Everything else goes through _normalize_item. Items read before a plugin failure are kept.
+    """
+    source = sys.intern(source)
+    append = items.append
+    for raw in raws:
+        if type(raw) is ServiceItem:
+            name = raw.name
+            price = raw.price
+            category = raw.category
+            if (
+                type(price) is float and 0.0 <= price < _INF  # NaN fails the comparisons
+                and type(name) is str and name and name.strip() is name
+                and (category is None or (type(category) is str and category and category.strip() is category))
+            ):
+                if raw.source != source:
+                    raw = ServiceItem.create(name, price, category, source, raw.url)
+                append(raw)
+                continue
+
+        item, item_errors = _normalize_item(raw, source)
+        if item is not None:
+            append(item)
+        if item_errors:
+            errors.extend(item_errors)
+
+
 def _normalize_item(raw: object, source: str) -> tuple[ServiceItem | None, list[str]]:
     errors: list[str] = []
     
@@ -43,7 +346,7 @@ def _normalize_item(raw: object, source: str) -> tuple[ServiceItem | None, list[
     # Current implementation handles dict and ServiceItem.
 
     if isinstance(raw, ServiceItem):
-        item = ServiceItem(
+        item = ServiceItem.create(
             name=raw.name.strip(),
             price=float(raw.price),
             category=raw.category.strip() if raw.category else None,
@@ -55,7 +358,7 @@ def _normalize_item(raw: object, source: str) -> tuple[ServiceItem | None, list[
         price = raw.get("price", None)
         category = raw.get("category", None)
         url = raw.get("url", None)
-        item = ServiceItem(
+        item = ServiceItem.create(
             name=name,
             price=float(price) if price is not None else float("nan"),
             category=str(category).strip() if category else None,
@@ -78,4 +381,5 @@ def _normalize_item(raw: object, source: str) -> tuple[ServiceItem | None, list[
 
 
 def _is_valid_price(value: float) -> bool:
-    return value >= 0 and value == value
+    # Finite and not negative (NaN fails the comparisons)
+    return 0 <= value < _INF
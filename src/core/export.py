@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from .models import ServiceItem
+from .store import ServiceStore
+
+EXPORT_FIELDS = ("name", "price", "category", "source", "url")
+EXPORT_FORMATS = ("csv", "jsonl")
+
+# Output is written in chunks of this size instead of row by row
+BUFFER_SIZE = 1 << 20
+
+# (name, price, category, source, url), see ServiceStore.records()
+Record = tuple[str, float, Optional[str], str, Optional[str]]
+
+
+def export_format(path: Path) -> str:
+    """Export format for a file name (by extension)."""
+    fmt = path.suffix.lower().lstrip(".")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {path.suffix or path.name}")
+    return fmt
+
+
+class ExportWriter:
+    """
+    Streams services to CSV or JSON Lines.
+
+    Rows are converted and written one at a time as they are read from the iterable,
+    so the output is never built in memory; buffering is left to `out`.
+    Can be fed batch by batch (e.g. from aggregate_stream()).
+    """
+
+    def __init__(self, out: TextIO, fmt: str) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        self._out = out
+        self._fmt = fmt
+        self._csv = csv.writer(out) if fmt == "csv" else None
+        self.count = 0
+        if self._csv is not None:
+            self._csv.writerow(EXPORT_FIELDS)
+
+    def write(self, items: Iterable[ServiceItem]) -> None:
+        self.write_records((item.name, item.price, item.category, item.source, item.url) for item in items)
+
+    def write_store(self, store: ServiceStore, rows: Iterable[int] | None = None) -> None:
+        """Writes `rows` of a columnar store (default: all rows) without creating items."""
+        self.write_records(store.records(rows))
+
+    def write_records(self, records: Iterable[Record]) -> None:
+        records = self._counted(records)
+        if self._csv is not None:
+            self._csv.writerows(records)
+        else:
+            self._out.writelines(
+                f'{{"name": {_string(name)}, "price": {_number(price)}, "category": {_optional(category)}, '
+                f'"source": {_string(source)}, "url": {_optional(url)}}}\n'
+                for name, price, category, source, url in records
+            )
+
+    def _counted(self, records: Iterable[Record]) -> Iterator[Record]:
+        for record in records:
+            self.count += 1
+            yield record
+
+
+# JSON string literal, non-ASCII characters are kept as is (as with ensure_ascii=False)
+_string = json.encoder.encode_basestring
+
+
+def _optional(value: str | None) -> str:
+    return "null" if value is None else _string(value)
+
+
+def _number(value: float) -> str:
+    # JSON has no Infinity/NaN; aggregation rejects them, anything else is written as null
+    return repr(value) if math.isfinite(value) else "null"
+
+
+@contextmanager
+def open_export(path: Path, fmt: str | None = None, buffer_size: int = BUFFER_SIZE) -> Iterator[ExportWriter]:
+    """
+    Opens `path` for export (format from the extension unless given):
+
+        with open_export(Path("services.csv")) as writer:
+            writer.write(items)
+
+    The file is written next to the target and only replaces it once the block succeeds.
+    CSV gets a UTF-8 BOM so that spreadsheet programs detect the encoding.
+    """
+    fmt = fmt or export_format(path)
+    tmp = path.with_name(path.name + ".tmp")
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    try:
+        with open(tmp, "w", encoding=encoding, newline="", buffering=buffer_size) as f:
+            yield ExportWriter(f, fmt)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
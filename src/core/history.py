@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .models import ServiceItem
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at REAL NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_taken_at ON snapshots(taken_at);
+
+-- Sources covered by a partial snapshot (a refresh of some sources only); none for a full one
+CREATE TABLE IF NOT EXISTS snapshot_sources (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    source TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, source)
+) WITHOUT ROWID;
+
+-- One row per distinct service; category is '' when the plugin gave none
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT,
+    last_price REAL,
+    last_seen INTEGER,
+    UNIQUE (source, category, name)
+);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items(category);
+CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);
+CREATE INDEX IF NOT EXISTS idx_items_source_name ON items(source, name);
+
+-- Only price changes are stored: an unchanged row adds nothing to the history
+CREATE TABLE IF NOT EXISTS prices (
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    price REAL NOT NULL,
+    PRIMARY KEY (item_id, snapshot_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_prices_snapshot ON prices(snapshot_id);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class PricePoint:
+    """Price of a service as of a snapshot (the moment it was first seen with this price)."""
+    taken_at: float
+    source: str
+    category: str | None
+    name: str
+    price: float
+    url: str | None = None
+
+
+class PriceHistory:
+    """
+    SQLite store of aggregated snapshots (data/history.sqlite3 in the application).
+
+    Every refresh appends one snapshot in a single transaction. Per service only price
+    changes are written, so repeated refreshes of an unchanged catalog stay cheap.
+    """
+
+    def __init__(self, db_file: Path) -> None:
+        self._db_file = db_file
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._db_file.parent.mkdir(parents=True, exist_ok=True)
+            # Transactions are managed explicitly (see SnapshotWriter)
+            conn = sqlite3.connect(self._db_file, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def record_snapshot(
+        self, items: Iterable[ServiceItem], taken_at: float | None = None, sources: Iterable[str] | None = None
+    ) -> int:
+        """Writes one snapshot of `items` and returns its id."""
+        with self.snapshot(taken_at, sources) as snapshot:
+            snapshot.add(items)
+        return snapshot.snapshot_id
+
+    def snapshot(self, taken_at: float | None = None, sources: Iterable[str] | None = None) -> SnapshotWriter:
+        """
+        Opens a snapshot that can be filled batch by batch (e.g. as sources finish):
+
+            with history.snapshot() as snapshot:
+                snapshot.add(batch)
+
+        Batches are only buffered; everything is written in one short transaction when the
+        block exits without an error (or on write()), so the database is not held meanwhile.
+        With `sources` given, the snapshot only covers those sources (a partial refresh): the
+        other sources are taken from the last snapshot that covered them.
+        """
+        return SnapshotWriter(self, time.time() if taken_at is None else taken_at, sources)
+
+    def snapshots(self) -> list[tuple[int, float, int]]:
+        """(id, taken_at, item_count) of all snapshots, oldest first."""
+        with self._lock:
+            return self._connection().execute(
+                "SELECT id, taken_at, item_count FROM snapshots ORDER BY taken_at"
+            ).fetchall()
+
+    def price_history(
+        self,
+        *,
+        source: str | None = None,
+        category: str | None = None,
+        name: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int | None = None,
+    ) -> list[PricePoint]:
+        """
+        Price changes matching the filters, ordered by service and time.
+        Every point holds the price valid from its snapshot until the next point of the same service.
+        """
+        return list(self._query(source, category, name, since, until, limit))
+
+    def latest(self, *, source: str | None = None, category: str | None = None) -> list[PricePoint]:
+        """Services as of the last snapshot that listed them, with their current price."""
+        sql = (
+            "SELECT s.taken_at, i.source, i.category, i.name, i.last_price, i.url "
+            "FROM items i JOIN snapshots s ON s.id = i.last_seen WHERE 1 = 1"
+        )
+        params: list[object] = []
+        if source is not None:
+            sql += " AND i.source = ?"
+            params.append(source)
+        if category is not None:
+            sql += " AND i.category = ?"
+            params.append(category)
+        sql += " ORDER BY i.source, i.category, i.name"
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [_point(row) for row in rows]
+
+    def items(self, snapshot_id: int | None = None) -> Iterator[ServiceItem]:
+        """
+        Services of a snapshot (the latest one by default) with the prices valid at that time,
+        ordered by source, category and name. Every source is taken from the last snapshot up to
+        this one that covered it. Only price changes are stored, so a service counts as listed
+        from its first snapshot up to the last one that saw it.
+        """
+        with self._lock:
+            conn = self._connection()
+            if snapshot_id is None:
+                snapshot_id = conn.execute("SELECT MAX(id) FROM snapshots").fetchone()[0]
+                if snapshot_id is None:
+                    return iter(())
+            elif conn.execute("SELECT 1 FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone() is None:
+                raise ValueError(f"Unknown snapshot: {snapshot_id}")
+            rows = conn.execute(
+                "WITH covering (source, snapshot_id) AS ("
+                "SELECT src.source, MAX(s.id) FROM (SELECT DISTINCT source FROM items) src "
+                "JOIN snapshots s ON s.id <= ?1 "
+                "WHERE NOT EXISTS (SELECT 1 FROM snapshot_sources WHERE snapshot_id = s.id) "
+                "OR EXISTS (SELECT 1 FROM snapshot_sources WHERE snapshot_id = s.id AND source = src.source) "
+                "GROUP BY src.source) "
+                "SELECT i.name, p.price, i.category, i.source, i.url "
+                "FROM items i JOIN covering c ON c.source = i.source JOIN prices p ON p.item_id = i.id "
+                "WHERE i.last_seen >= c.snapshot_id AND p.snapshot_id = ("
+                "SELECT MAX(snapshot_id) FROM prices WHERE item_id = i.id AND snapshot_id <= ?1) "
+                "ORDER BY i.source, i.category, i.name",
+                (snapshot_id,),
+            ).fetchall()
+        return (
+            ServiceItem.create(name, price, category or None, source, url)
+            for name, price, category, source, url in rows
+        )
+
+    def _query(
+        self,
+        source: str | None,
+        category: str | None,
+        name: str | None,
+        since: float | None,
+        until: float | None,
+        limit: int | None,
+    ) -> Iterator[PricePoint]:
+        sql = (
+            "SELECT s.taken_at, i.source, i.category, i.name, p.price, i.url "
+            "FROM items i "
+            "JOIN prices p ON p.item_id = i.id "
+            "JOIN snapshots s ON s.id = p.snapshot_id "
+            "WHERE 1 = 1"
+        )
+        params: list[object] = []
+        if source is not None:
+            sql += " AND i.source = ?"
+            params.append(source)
+        if category is not None:
+            sql += " AND i.category = ?"
+            params.append(category)
+        if name is not None:
+            sql += " AND i.name = ?"
+            params.append(name)
+        if since is not None:
+            sql += " AND s.taken_at >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND s.taken_at <= ?"
+            params.append(until)
+        sql += " ORDER BY i.source, i.category, i.name, s.taken_at"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        for row in rows:
+            yield _point(row)
+
+
+class SnapshotWriter:
+    """
+    One snapshot being collected, see PriceHistory.snapshot(). Rows are kept in memory until
+    write(), which raises sqlite3.Error/OSError if the database cannot be opened or written.
+    """
+
+    def __init__(self, history: PriceHistory, taken_at: float, sources: Iterable[str] | None = None) -> None:
+        self._history = history
+        self._taken_at = taken_at
+        self._sources = sorted(set(sources)) if sources is not None else None
+        self._rows: list[tuple[str, str, str, str | None, float]] = []
+        self.snapshot_id = 0
+
+    def __enter__(self) -> SnapshotWriter:
+        return self
+
+    def add(self, items: Iterable[ServiceItem]) -> None:
+        self._rows.extend((i.source, i.category or "", i.name, i.url, i.price) for i in items)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.write()
+
+    def write(self) -> int:
+        """Writes the buffered rows as one snapshot and returns its id (0 if it covers no source)."""
+        rows, self._rows = self._rows, []
+        if self._sources is not None and not self._sources:
+            # Without sources rows it would read as a full snapshot
+            return self.snapshot_id
+        with self._history._lock:
+            conn = self._history._connection()
+            conn.execute("BEGIN")
+            try:
+                self.snapshot_id = conn.execute(
+                    "INSERT INTO snapshots (taken_at) VALUES (?)", (self._taken_at,)
+                ).lastrowid
+                if self._sources is not None:
+                    conn.executemany(
+                        "INSERT INTO snapshot_sources (snapshot_id, source) VALUES (?, ?)",
+                        [(self.snapshot_id, source) for source in self._sources],
+                    )
+                conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS staging ("
+                    "source TEXT, category TEXT, name TEXT, url TEXT, price REAL)"
+                )
+                conn.execute("DELETE FROM staging")
+                conn.executemany("INSERT INTO staging VALUES (?, ?, ?, ?, ?)", rows)
+                self._merge(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return self.snapshot_id
+
+    def _merge(self, conn: sqlite3.Connection) -> None:
+        # A snapshot may list the same service twice, keep the lowest price
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS snapshot_rows ("
+            "source TEXT, category TEXT, name TEXT, url TEXT, price REAL, "
+            "PRIMARY KEY (source, category, name))"
+        )
+        conn.execute("DELETE FROM snapshot_rows")
+        conn.execute(
+            "INSERT INTO snapshot_rows "
+            "SELECT source, category, name, MAX(url), MIN(price) FROM staging "
+            "GROUP BY source, category, name"
+        )
+        conn.execute("DELETE FROM staging")
+
+        conn.execute(
+            "INSERT OR IGNORE INTO items (source, category, name, url) "
+            "SELECT source, category, name, url FROM snapshot_rows"
+        )
+        conn.execute(
+            "INSERT INTO prices (item_id, snapshot_id, price) "
+            "SELECT i.id, ?, s.price FROM snapshot_rows s "
+            "JOIN items i ON i.source = s.source AND i.category = s.category AND i.name = s.name "
+            "WHERE i.last_price IS NULL OR i.last_price != s.price",
+            (self.snapshot_id,),
+        )
+        # An upsert of rows that all exist by now updates them; UPDATE ... FROM needs SQLite 3.33
+        conn.execute(
+            "INSERT INTO items (source, category, name, url, last_price, last_seen) "
+            "SELECT source, category, name, url, price, ? FROM snapshot_rows WHERE true "
+            "ON CONFLICT (source, category, name) DO UPDATE SET "
+            "last_price = excluded.last_price, url = excluded.url, last_seen = excluded.last_seen",
+            (self.snapshot_id,),
+        )
+        count = conn.execute("SELECT COUNT(*) FROM snapshot_rows").fetchone()[0]
+        conn.execute("UPDATE snapshots SET item_count = ? WHERE id = ?", (count, self.snapshot_id))
+        conn.execute("DELETE FROM snapshot_rows")
+
+
+def _point(row: tuple) -> PricePoint:
+    taken_at, source, category, name, price, url = row
+    return PricePoint(
+        taken_at=taken_at,
+        source=source,
+        category=category or None,
+        name=name,
+        price=price,
+        url=url,
+    )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Headers that describe the transfer, not the stored (already decoded) body
+_SKIP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    file: str
+    size: int
+    stored_at: float
+    last_access: float
+    max_age: float | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def is_fresh(self, now: float) -> bool:
+        return self.max_age is not None and now - self.stored_at < self.max_age
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk cache of GET response bodies with their validators (ETag / Last-Modified).
+
+    Fresh entries (Cache-Control max-age) are served without network access, stale ones
+    are revalidated with a conditional request. The total body size is bounded, least
+    recently used entries are evicted first.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._dir = cache_dir
+        self._index_file = cache_dir / self.INDEX_FILE
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: dict[str, CacheEntry] = self._read_index()
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if not (self._dir / entry.file).exists():
+                del self._entries[url]
+                return None
+            return entry
+
+    def read_body(self, entry: CacheEntry) -> bytes | None:
+        try:
+            body = (self._dir / entry.file).read_bytes()
+        except OSError:
+            return None
+        with self._lock:
+            entry.last_access = time.time()
+            self._write_index()
+        return body
+
+    def store(self, url: str, body: bytes, headers: dict[str, str]) -> CacheEntry | None:
+        """Stores a 200 response. Returns None if the response must not be cached."""
+        directives = parse_cache_control(headers.get("Cache-Control", ""))
+        if "no-store" in directives or len(body) > self.max_bytes:
+            return None
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        max_age = _max_age(directives)
+        if not etag and not last_modified and not max_age:
+            # Nothing to revalidate with and nothing fresh to serve
+            return None
+
+        now = time.time()
+        entry = CacheEntry(
+            url=url,
+            file=hashlib.sha256(url.encode("utf-8")).hexdigest() + ".body",
+            size=len(body),
+            stored_at=now,
+            last_access=now,
+            max_age=max_age,
+            etag=etag,
+            last_modified=last_modified,
+            headers={k: v for k, v in headers.items() if k.lower() not in _SKIP_HEADERS},
+        )
+        with self._lock:
+            try:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                _atomic_write(self._dir / entry.file, body)
+            except OSError:
+                return None
+            self._entries[url] = entry
+            self._evict()
+            self._write_index()
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: dict[str, str]) -> None:
+        """Updates an entry after a 304 Not Modified response."""
+        directives = parse_cache_control(headers.get("Cache-Control", ""))
+        with self._lock:
+            entry.stored_at = entry.last_access = time.time()
+            if "Cache-Control" in headers:
+                entry.max_age = _max_age(directives)
+            entry.etag = headers.get("ETag", entry.etag)
+            entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+            self._write_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                (self._dir / entry.file).unlink(missing_ok=True)
+            self._entries.clear()
+            self._write_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.size for e in self._entries.values())
+
+    def _evict(self) -> None:
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_access):
+            if total <= self.max_bytes:
+                break
+            (self._dir / entry.file).unlink(missing_ok=True)
+            del self._entries[entry.url]
+            total -= entry.size
+
+    def _read_index(self) -> dict[str, CacheEntry]:
+        try:
+            with open(self._index_file, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            return {e["url"]: CacheEntry(**e) for e in raw}
+        except (OSError, json.JSONDecodeError, TypeError, KeyError):
+            return {}
+
+    def _write_index(self) -> None:
+        data = json.dumps([asdict(e) for e in self._entries.values()], ensure_ascii=False)
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(self._index_file, data.encode("utf-8"))
+        except OSError:
+            pass
+
+
+def parse_cache_control(value: str) -> dict[str, str | None]:
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        key, _, arg = part.partition("=")
+        directives[key.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _max_age(directives: dict[str, str | None]) -> float | None:
+    if "no-cache" in directives:
+        return 0.0
+    try:
+        return float(directives["max-age"])  # type: ignore[arg-type]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+_default_cache: HttpCache | None = None
+
+
+def configure_default_cache(cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> HttpCache:
+    """Sets the cache used by the shared HTTP client. Call before plugins start fetching."""
+    global _default_cache
+    _default_cache = HttpCache(cache_dir, max_bytes)
+    return _default_cache
+
+
+def get_default_cache() -> HttpCache | None:
+    return _default_cache
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .http_cache import CacheEntry, HttpCache, get_default_cache
+from .metrics import add_fetched_bytes
+
+# Methods that are safe to repeat after a network failure
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Statuses worth another attempt (rate limit and temporary gateway/server problems)
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class HttpClient:
+    """
+    Shared HTTP client for parser plugins.
+
+    Keeps one requests.Session with a per-host connection pool (keep-alive),
+    negotiates gzip/deflate, retries idempotent requests with bounded exponential
+    backoff and limits the number of simultaneous requests to one host.
+    With a cache attached, GET requests are revalidated with ETag / Last-Modified
+    and fresh responses are served from disk without touching the network.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 5.0,
+        per_host_limit: int = 4,
+        user_agent: str = "CarServiceAggregator/1.0",
+        cache: HttpCache | None = None,
+    ) -> None:
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.per_host_limit = per_host_limit
+
+        self._session = requests.Session()
+        # Retries are handled here, so that backoff is bounded and only idempotent methods are repeated
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def get(self, url: str, *, use_cache: bool = True, **kwargs: Any) -> requests.Response:
+        if self.cache is None or not use_cache:
+            return self.request("GET", url, **kwargs)
+        return self._cached_get(self.cache, url, **kwargs)
+
+    def request(self, method: str, url: str, *, timeout: float = 15, **kwargs: Any) -> requests.Response:
+        """
+        `timeout` bounds the whole call, retries and backoff included: every attempt only gets
+        the time that is left, and no attempt is started once the deadline has passed.
+        A read timeout is not retried, the server is answering, just too slowly.
+        """
+        method = method.upper()
+        attempts = 1 + (self.max_retries if method in IDEMPOTENT_METHODS else 0)
+        deadline = time.monotonic() + timeout
+
+        for attempt in range(attempts):
+            remaining = deadline - time.monotonic()
+            last_attempt = attempt == attempts - 1
+            try:
+                with self._host_slot(url):
+                    response = self._session.request(method, url, timeout=max(remaining, 0.001), **kwargs)
+            except requests.ReadTimeout:
+                raise
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if last_attempt:
+                    raise
+                failure: requests.Response | Exception = exc
+            else:
+                if not kwargs.get("stream"):
+                    # The body has already been read, credit it to the plugin loading on this thread
+                    add_fetched_bytes(_wire_bytes(response))
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                failure = response
+
+            delay = self._backoff(attempt)
+            if time.monotonic() + delay >= deadline:
+                # No time left for another attempt: give up with what the last one produced
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+            if isinstance(failure, requests.Response):
+                failure.close()
+            time.sleep(delay)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _cached_get(self, cache: HttpCache, url: str, **kwargs: Any) -> requests.Response:
+        entry = cache.lookup(url)
+        if entry is not None and entry.is_fresh(time.time()):
+            body = cache.read_body(entry)
+            if body is not None:
+                return _cached_response(url, entry, body)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        conditional = dict(headers)
+        if entry is not None:
+            conditional.update(entry.conditional_headers())
+
+        response = self.request("GET", url, headers=conditional, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            body = cache.read_body(entry)
+            if body is not None:
+                cache.revalidated(entry, dict(response.headers))
+                return _cached_response(url, entry, body)
+            # Cached body is gone, fetch the full page again
+            response = self.request("GET", url, headers=headers, **kwargs)
+
+        if response.status_code == 200:
+            cache.store(url, response.content, dict(response.headers))
+        return response
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self.backoff_factor * (2 ** attempt), self.backoff_max)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_limits.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = slot
+        return slot
+
+
+def _wire_bytes(response: requests.Response) -> int:
+    """Body bytes as received (before gzip/deflate decoding), falling back to Content-Length."""
+    try:
+        received = response.raw.tell()
+    except Exception:
+        received = 0
+    if received:
+        return received
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return len(response.content)
+
+
+def _cached_response(url: str, entry: CacheEntry, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = url
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True  # type: ignore[attr-defined]
+    return response
+
+
+_shared_client: HttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Returns the process-wide client, creating it on first use (with the default cache, if configured)."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient(cache=get_default_cache())
+        return _shared_client
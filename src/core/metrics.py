@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .plugin_base import PluginBase
+
+
+@dataclass(slots=True)
+class PluginMetrics:
+    """
+    Timing and throughput of one plugin in an aggregation run.
+
+    For sources `items` are the services kept after normalization and `rejected` the rows
+    that were dropped; for processors `rejected` counts the input items that did not come out.
+    Times are seconds: `wall_time` is the time spent in the plugin, `first_item_time` the time
+    until its first item (for processors both without the time spent in upstream stages).
+    `bytes_fetched` are response bodies as transferred, i.e. before gzip/deflate decoding.
+    Counters add up when a record is reused, e.g. for a processor over several batches.
+    """
+    plugin_id: str
+    name: str
+    kind: str  # "source" or "processor"
+    wall_time: float = 0.0
+    first_item_time: float | None = None
+    items: int = 0
+    rejected: int = 0
+    bytes_fetched: int = 0
+    exception: str | None = None
+
+    @classmethod
+    def for_plugin(cls, plugin: PluginBase, kind: str) -> PluginMetrics:
+        return cls(plugin_id=plugin.id, name=plugin.name, kind=kind)
+
+
+def metrics_to_json(metrics: Iterable[PluginMetrics], taken_at: float | None = None) -> str:
+    return json.dumps(
+        {
+            "taken_at": time.time() if taken_at is None else taken_at,
+            "plugins": [asdict(m) for m in metrics],
+        },
+        ensure_ascii=False,
+        indent=1,
+    )
+
+
+def write_metrics(path: Path, metrics: Iterable[PluginMetrics], taken_at: float | None = None) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(metrics_to_json(metrics, taken_at))
+        f.write("\n")
+
+
+# Bytes downloaded on the current thread (as transferred, i.e. compressed), see count_fetched_bytes()
+_counters = threading.local()
+
+
+class ByteCounter:
+    __slots__ = ("bytes",)
+
+    def __init__(self) -> None:
+        self.bytes = 0
+
+
+@contextmanager
+def count_fetched_bytes() -> Iterator[ByteCounter]:
+    """Counts the bytes the shared HTTP client downloads on this thread inside the block."""
+    previous = getattr(_counters, "current", None)
+    counter = _counters.current = ByteCounter()
+    try:
+        yield counter
+    finally:
+        _counters.current = previous
+        if previous is not None:
+            previous.bytes += counter.bytes
+
+
+def add_fetched_bytes(count: int) -> None:
+    """Called by the HTTP client for every downloaded body, with its size on the wire."""
+    counter = getattr(_counters, "current", None)
+    if counter is not None:
+        counter.bytes += count
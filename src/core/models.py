@@ -1,13 +1,49 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Optional
 
+_intern = sys.intern
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ServiceItem:
     name: str
     price: float
     category: Optional[str]
     source: str
     url: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        price: float,
+        category: Optional[str],
+        source: str,
+        url: Optional[str] = None,
+    ) -> ServiceItem:
+        """
+        Fast constructor for hot paths (parsers, normalization, processors).
+
+        Interns category/source/url, which repeat for thousands of rows, and fills
+        the slots directly instead of going through the frozen dataclass __init__.
+        Arguments are not converted or validated.
+        """
+        item = _new(cls)
+        _set_name(item, name)
+        _set_price(item, price)
+        _set_category(item, _intern(category) if category else category)
+        _set_source(item, _intern(source) if source else source)
+        _set_url(item, _intern(url) if url else url)
+        return item
+
+
+# Slot descriptors bypass the frozen __setattr__ (used by ServiceItem.create)
+_new = object.__new__
+_set_name = ServiceItem.__dict__["name"].__set__
+_set_price = ServiceItem.__dict__["price"].__set__
+_set_category = ServiceItem.__dict__["category"].__set__
+_set_source = ServiceItem.__dict__["source"].__set__
+_set_url = ServiceItem.__dict__["url"].__set__
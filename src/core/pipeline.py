@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Iterator, Sequence
+
+from .metrics import PluginMetrics
+from .models import ServiceItem
+from .plugin_base import PluginBase
+from .profiling import open_section
+
+
+def run_chain(
+    items: Iterable[ServiceItem],
+    processors: Iterable[PluginBase],
+    errors: list[str],
+    metrics: Sequence[PluginMetrics] | None = None,
+) -> Iterator[ServiceItem]:
+    """
+    Chains processors lazily: every item flows through all stages before the next one is read,
+    nothing is materialized between stages. Consume the result once at the sink.
+
+    A failing processor is reported into `errors` and its stage falls back to pass-through:
+    items it has already produced stay in the stream, the rest of its input goes on unchanged.
+    With `metrics` (one record per processor, in chain order) every stage adds its timings
+    and counts to its record. With profiling enabled every stage is a section of its own.
+    """
+    stream: Iterator[ServiceItem] = iter(items)
+    for position, proc in enumerate(processors):
+        section = open_section("process", proc.name)
+        if section is not None:
+            # The processor's reads run the upstream stages, those are not this section's
+            stream = section.paused(stream)
+        if metrics is None:
+            stream = _guarded_stage(proc, stream, errors)
+        else:
+            stream = _measured_stage(proc, stream, errors, metrics[position])
+        if section is not None:
+            stream = section.wrap(stream)
+    return stream
+
+
+def _guarded_stage(proc: PluginBase, upstream: Iterator[ServiceItem], errors: list[str]) -> Iterator[ServiceItem]:
+    recorder = _InFlightRecorder(upstream)
+    try:
+        for item in proc.process(recorder):
+            # Everything read so far has been turned into output (or dropped on purpose)
+            recorder.in_flight.clear()
+            yield item
+    except Exception as exc:
+        errors.append(f"Processor {proc.name}: {exc}")
+        # Items the processor had read but not yet answered for, then the untouched rest
+        yield from recorder.in_flight
+        yield from recorder.upstream
+
+
+def _measured_stage(
+    proc: PluginBase, upstream: Iterator[ServiceItem], errors: list[str], record: PluginMetrics
+) -> Iterator[ServiceItem]:
+    """_guarded_stage() that also measures the time spent in the processor itself."""
+    recorder = _TimedRecorder(upstream)
+    produced = passed = 0
+    busy = 0.0
+    started = resumed = time.perf_counter()
+    try:
+        for item in proc.process(recorder):
+            now = time.perf_counter()
+            busy += now - resumed
+            if produced == 0 and record.first_item_time is None:
+                record.first_item_time = now - started - recorder.upstream_time
+            recorder.in_flight.clear()
+            produced += 1
+            yield item
+            resumed = time.perf_counter()
+        busy += time.perf_counter() - resumed
+    except Exception as exc:
+        busy += time.perf_counter() - resumed
+        errors.append(f"Processor {proc.name}: {exc}")
+        record.exception = type(exc).__name__
+        # Items the processor had read but not yet answered for go on unchanged
+        produced += len(recorder.in_flight)
+        yield from recorder.in_flight
+        for item in recorder.upstream:
+            passed += 1
+            yield item
+    finally:
+        # Upstream stages run inside the processor's reads, their time is not the processor's
+        record.wall_time += busy - recorder.upstream_time
+        record.items += produced + passed
+        record.rejected += recorder.count - produced
+
+
+class _InFlightRecorder:
+    """Iterator wrapper that remembers items read by a processor since its last output."""
+
+    __slots__ = ("upstream", "in_flight")
+
+    def __init__(self, upstream: Iterator[ServiceItem]) -> None:
+        self.upstream = upstream
+        self.in_flight: list[ServiceItem] = []
+
+    def __iter__(self) -> _InFlightRecorder:
+        return self
+
+    def __next__(self) -> ServiceItem:
+        item = next(self.upstream)
+        self.in_flight.append(item)
+        return item
+
+
+class _TimedRecorder(_InFlightRecorder):
+    """_InFlightRecorder that also counts the items read and the time spent reading them."""
+
+    __slots__ = ("count", "upstream_time")
+
+    def __init__(self, upstream: Iterator[ServiceItem]) -> None:
+        super().__init__(upstream)
+        self.count = 0
+        self.upstream_time = 0.0
+
+    def __next__(self) -> ServiceItem:
+        started = time.perf_counter()
+        try:
+            item = next(self.upstream)
+        finally:
+            self.upstream_time += time.perf_counter() - started
+        self.in_flight.append(item)
+        self.count += 1
+        return item
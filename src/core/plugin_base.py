@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
 from .models import ServiceItem
 
+if TYPE_CHECKING:
+    from .http_client import HttpClient
+
 
 class PluginBase(ABC):
     # Metadata
@@ -16,6 +19,9 @@ class PluginBase(ABC):
     version: str = "0.0"
     release_date: str = "1970-01-01"
     description: str = ""
+    # Minutes between background refreshes of a Source/Parser, 0 = manual refresh only.
+    # A "refresh_interval" setting in settings_schema takes precedence.
+    refresh_interval: int = 0
 
     # Configuration storage (key -> value)
     settings: dict[str, Any] = {}
@@ -28,6 +34,13 @@ class PluginBase(ABC):
         # Initialize default settings
         self.settings = {k: v.get("default") for k, v in self.settings_schema.items()}
 
+    @property
+    def http(self) -> HttpClient:
+        """Shared pooled HTTP client for network access (keep-alive, retries, per-host limits)."""
+        # Imported lazily so that plugins without network access do not pull in `requests`
+        from .http_client import get_http_client
+        return get_http_client()
+
     def load(self) -> Iterable[ServiceItem]:
         """Main logic to load data (for Source plugins)."""
         return []
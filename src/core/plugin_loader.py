@@ -1,48 +1,186 @@
 from __future__ import annotations
 
+import hashlib
 import importlib.util
+import json
+import os
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from types import ModuleType
-from typing import Iterable
+from typing import Any, Iterable
 
 from .plugin_base import PluginBase
+from .profiling import profiled
 
+MANIFEST_VERSION = 2
+METADATA_FIELDS = (
+    "id", "name", "plugin_type", "author", "version", "release_date", "description", "refresh_interval",
+)
 
-def load_plugins(plugin_dir: Path) -> tuple[list[PluginBase], list[str]]:
-    plugins: list[PluginBase] = []
-    loaded_ids: set[str] = set()
-    errors: list[str] = []
 
-    if not plugin_dir.exists():
-        errors.append(f"Plugin directory not found: {plugin_dir}")
-        return plugins, errors
+def load_plugins(plugin_dir: Path, manifest_file: Path | None = None) -> tuple[list[PluginBase], list[str]]:
+    """
+    Loads all plugins from `plugin_dir`.
 
-    for plugin_file in sorted(plugin_dir.glob("*.py")):
-        if plugin_file.name.startswith("_"):
-            continue
+    With a manifest file, plugins whose file is unchanged since the last run are not imported:
+    a LazyPlugin is created from the cached metadata and the module is only executed when the
+    plugin is actually used (load/process).
+    """
+    plugins, errors, _ = PluginRegistry(plugin_dir, manifest_file).reload()
+    return plugins, errors
 
-        module = _load_module(plugin_file, errors)
-        if module is None:
-            continue
 
-        plugin = _create_plugin(module, errors)
-        if plugin is None:
-            errors.append(f"{plugin_file.name}: no plugin class found")
-            continue
+@dataclass
+class ReloadReport:
+    """File names per outcome of PluginRegistry.reload()."""
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
 
-        if plugin.id in loaded_ids:
-            errors.append(f"{plugin_file.name}: Duplicate Plugin ID {plugin.id} (already loaded). Skipped.")
-            continue
-        
-        # Simple validation for ID
-        if not plugin.id or plugin.id == "00000000-0000-0000-0000-000000000000":
-             errors.append(f"{plugin_file.name}: Invalid Plugin ID. Skipped.")
-             continue
+    @property
+    def changed(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
 
-        loaded_ids.add(plugin.id)
-        plugins.append(plugin)
 
-    return plugins, errors
+@dataclass
+class _PluginFile:
+    mtime_ns: int
+    size: int
+    sha256: str
+    plugin: PluginBase
+
+
+class PluginRegistry:
+    """
+    Keeps the plugins of a directory and reloads them incrementally.
+
+    reload() only imports files that were added or modified (mtime/size, then content hash),
+    unchanged files keep their plugin objects (with all settings). A modified plugin gets the
+    settings of its previous instance for every key whose schema entry did not change.
+    If a modified file fails to load, the previous instance stays active.
+    """
+
+    def __init__(self, plugin_dir: Path, manifest_file: Path | None = None) -> None:
+        self._plugin_dir = plugin_dir
+        self._manifest_file = manifest_file
+        self._files: dict[Path, _PluginFile] = {}
+
+    def reload(self) -> tuple[list[PluginBase], list[str], ReloadReport]:
+        with profiled("load_plugins"):
+            return self._reload()
+
+    def _reload(self) -> tuple[list[PluginBase], list[str], ReloadReport]:
+        errors: list[str] = []
+        report = ReloadReport()
+
+        if not self._plugin_dir.exists():
+            errors.append(f"Plugin directory not found: {self._plugin_dir}")
+            report.removed.extend(f.name for f in self._files)
+            self._files.clear()
+            return [], errors, report
+
+        cache = ManifestCache(self._manifest_file) if self._manifest_file is not None else None
+        present = [f for f in sorted(self._plugin_dir.glob("*.py")) if not f.name.startswith("_")]
+
+        for plugin_file in sorted(set(self._files) - set(present)):
+            report.removed.append(plugin_file.name)
+            del self._files[plugin_file]
+
+        for plugin_file in present:
+            try:
+                stat = plugin_file.stat()
+            except OSError as exc:
+                errors.append(f"{plugin_file.name}: {exc}")
+                continue
+
+            previous = self._files.get(plugin_file)
+            if previous is not None and _is_unchanged(previous, plugin_file, stat):
+                previous.mtime_ns, previous.size = stat.st_mtime_ns, stat.st_size
+                report.unchanged.append(plugin_file.name)
+                continue
+
+            plugin = _lazy_plugin(plugin_file, cache)
+            if plugin is None:
+                plugin = _import_plugin(plugin_file, cache, errors)
+            if plugin is None:
+                continue
+
+            if previous is not None:
+                _carry_settings(previous.plugin, plugin)
+                report.updated.append(plugin_file.name)
+            else:
+                report.added.append(plugin_file.name)
+            # The manifest has just hashed the file (or matched it by mtime/size), do not read it again
+            sha256 = cache.sha256(plugin_file) if cache is not None else None
+            self._files[plugin_file] = _PluginFile(
+                stat.st_mtime_ns, stat.st_size, sha256 or _file_hash(plugin_file), plugin
+            )
+
+        if cache is not None:
+            cache.save(self._plugin_dir)
+
+        plugins: list[PluginBase] = []
+        loaded_ids: set[str] = set()
+        for plugin_file in present:
+            state = self._files.get(plugin_file)
+            if state is None:
+                continue
+            plugin = state.plugin
+
+            if plugin.id in loaded_ids:
+                errors.append(f"{plugin_file.name}: Duplicate Plugin ID {plugin.id} (already loaded). Skipped.")
+                continue
+            
+            # Simple validation for ID
+            if not plugin.id or plugin.id == "00000000-0000-0000-0000-000000000000":
+                 errors.append(f"{plugin_file.name}: Invalid Plugin ID. Skipped.")
+                 continue
+
+            loaded_ids.add(plugin.id)
+            plugins.append(plugin)
+
+        return plugins, errors, report
+
+
+def _is_unchanged(previous: _PluginFile, plugin_file: Path, stat: os.stat_result) -> bool:
+    if previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+        return True
+    return previous.sha256 == _file_hash(plugin_file)
+
+
+def _carry_settings(old: PluginBase, new: PluginBase) -> None:
+    carried = {
+        key: value for key, value in old.settings.items()
+        if key in new.settings_schema and old.settings_schema.get(key) == new.settings_schema[key]
+    }
+    if carried:
+        new.update_settings(carried)
+
+
+def _import_plugin(plugin_file: Path, cache: ManifestCache | None, errors: list[str]) -> PluginBase | None:
+    module = _load_module(plugin_file, errors)
+    if module is None:
+        return None
+
+    plugin = _create_plugin(module, errors)
+    if plugin is None:
+        errors.append(f"{plugin_file.name}: no plugin class found")
+        return None
+
+    if cache is not None:
+        cache.store(plugin_file, plugin)
+    return plugin
+
+
+def _lazy_plugin(plugin_file: Path, cache: ManifestCache | None) -> LazyPlugin | None:
+    if cache is None:
+        return None
+    manifest = cache.lookup(plugin_file)
+    if manifest is None:
+        return None
+    return LazyPlugin(plugin_file, manifest)
 
 
 def _load_module(plugin_file: Path, errors: list[str]) -> ModuleType | None:
@@ -93,3 +231,145 @@ def _coerce_plugin(candidate: object) -> PluginBase | None:
     if isinstance(candidate, PluginBase):
         return candidate
     return None
+
+
+class LazyPlugin(PluginBase):
+    """
+    Stand-in for a plugin built from its cached manifest.
+
+    Exposes the metadata and settings without importing the plugin module. The module is
+    executed on first load()/process() (or any other attribute access); the settings entered
+    until then are handed over to the real plugin instance.
+    """
+
+    def __init__(self, plugin_file: Path, manifest: dict[str, Any]) -> None:
+        for field in METADATA_FIELDS:
+            setattr(self, field, manifest[field])
+        self.settings_schema = manifest["settings_schema"]
+        super().__init__()
+        self.plugin_file = plugin_file
+        self._plugin: PluginBase | None = None
+        self._resolve_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._plugin is not None
+
+    def resolve(self) -> PluginBase:
+        """Imports the plugin module and returns the real plugin instance."""
+        with self._resolve_lock:
+            if self._plugin is None:
+                errors: list[str] = []
+                module = _load_module(self.plugin_file, errors)
+                plugin = _create_plugin(module, errors) if module is not None else None
+                if plugin is None:
+                    raise RuntimeError("; ".join(errors) or f"{self.plugin_file.name}: no plugin class found")
+                plugin.update_settings(self.settings)
+                # From now on both objects share one settings dict
+                self.settings = plugin.settings
+                self._plugin = plugin
+            return self._plugin
+
+    def load(self):
+        return self.resolve().load()
+
+    def process(self, items):
+        return self.resolve().process(items)
+
+    def update_settings(self, new_settings: dict[str, Any]) -> None:
+        if self._plugin is not None:
+            self._plugin.update_settings(new_settings)
+        else:
+            super().update_settings(new_settings)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes LazyPlugin itself does not have (plugin specific helpers)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
+class ManifestCache:
+    """
+    JSON cache of plugin metadata and settings schemas, keyed by file path.
+
+    An entry is valid while the file has the same mtime and size; if those changed,
+    the content hash decides (a touched but unchanged file keeps its entry).
+    """
+
+    def __init__(self, manifest_file: Path) -> None:
+        self._file = manifest_file
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+                self._entries = data.get("plugins", {})
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def lookup(self, plugin_file: Path) -> dict[str, Any] | None:
+        entry = self._entries.get(str(plugin_file))
+        if entry is None:
+            return None
+        try:
+            stat = plugin_file.stat()
+        except OSError:
+            return None
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["manifest"]
+        if entry["sha256"] != _file_hash(plugin_file):
+            return None
+        entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+        self._dirty = True
+        return entry["manifest"]
+
+    def store(self, plugin_file: Path, plugin: PluginBase) -> None:
+        manifest = {field: getattr(plugin, field) for field in METADATA_FIELDS}
+        manifest["settings_schema"] = plugin.settings_schema
+        try:
+            # Plugins with settings that cannot be represented in JSON are always imported
+            manifest = json.loads(json.dumps(manifest, ensure_ascii=False))
+            stat = plugin_file.stat()
+        except (TypeError, ValueError, OSError):
+            # An entry of an older version of the file would be stale
+            if self._entries.pop(str(plugin_file), None) is not None:
+                self._dirty = True
+            return
+        self._entries[str(plugin_file)] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _file_hash(plugin_file),
+            "manifest": manifest,
+        }
+        self._dirty = True
+
+    def sha256(self, plugin_file: Path) -> str | None:
+        """Content hash of the file's entry as of the last lookup()/store(), None without an entry."""
+        entry = self._entries.get(str(plugin_file))
+        return entry["sha256"] if entry is not None else None
+
+    def save(self, plugin_dir: Path) -> None:
+        """Writes the cache, dropping entries of files that no longer exist in `plugin_dir`."""
+        stale = [key for key in self._entries if Path(key).parent == plugin_dir and not Path(key).exists()]
+        for key in stale:
+            del self._entries[key]
+        if not self._dirty and not stale:
+            return
+        try:
+            self._file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._file.with_name(self._file.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "plugins": self._entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self._file)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+def _file_hash(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
@@ -0,0 +1,246 @@
+"""
+Opt-in profiling hooks around plugin loading, source loads, processor stages and filtering.
+
+Off by default: profiled() then returns a shared no-op context manager and open_section()
+returns None, so the hooks cost a global lookup. Once enable()d (the "Справка" menu toggle
+or the CARSERVICE_PROFILE environment variable), every hooked block is a section that is run
+under its own cProfile.Profile while tracemalloc traces allocations. Sections are grouped into
+runs: a run is a directory `<profiles>/<timestamp>-<label>/` and every section in it is written
+as `NN-<name>.pstats` (open with pstats or snakeviz) plus `NN-<name>.txt` with the wall time
+and the lines that allocated the most memory while the section was open.
+
+Sections opened while a run is active (e.g. the sources of a refresh, on the pool threads)
+join it, a section outside any run gets a run of its own. tracemalloc is process-wide, so the
+allocations of sections that overlap in time (concurrent sources) show up in each of them.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+
+PROFILE_ENV = "CARSERVICE_PROFILE"
+TOP_ALLOCATIONS = 25
+
+T = TypeVar("T")
+
+_NULL = nullcontext()
+_lock = threading.Lock()
+# Profiles are written below this directory, None while profiling is off
+_directory: Path | None = None
+_started_tracing = False
+_run: ProfileRun | None = None
+_run_users = 0
+
+
+def enable(directory: Path) -> None:
+    global _directory, _started_tracing
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _directory = directory
+
+
+def disable() -> None:
+    global _directory, _started_tracing
+    with _lock:
+        _directory = None
+        if _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def is_enabled() -> bool:
+    return _directory is not None
+
+
+def enable_from_environment(directory: Path) -> bool:
+    """Enables profiling into `directory` if CARSERVICE_PROFILE is set (and not "0")."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value and value != "0":
+        enable(directory)
+    return is_enabled()
+
+
+def profile_run(label: str):
+    """Groups the sections opened inside the block into one run (joins the active run if any)."""
+    directory = _directory
+    if directory is None:
+        return _NULL
+    return _joined_run(directory, label)
+
+
+def profiled(kind: str, subject: str | None = None):
+    """Profiles the block as section "<kind> <subject>"."""
+    directory = _directory
+    if directory is None:
+        return _NULL
+    return _profiled_block(directory, _section_name(kind, subject))
+
+
+def open_section(kind: str, subject: str | None = None) -> ProfileSection | None:
+    """
+    A section for code that runs interleaved with other sections on the same thread (generator
+    stages), see ProfileSection.wrap(). None while profiling is off.
+    """
+    directory = _directory
+    if directory is None:
+        return None
+    return ProfileSection(directory, _section_name(kind, subject))
+
+
+class ProfileRun:
+    def __init__(self, directory: Path, label: str) -> None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        self.directory = directory / f"{stamp}-{_slug(label)}"
+        self._lock = threading.Lock()
+        self._sections = 0
+
+    def write(self, section: ProfileSection, wall_time: float, before, after) -> None:
+        with self._lock:
+            self._sections += 1
+            stem = f"{self._sections:02d}-{_slug(section.name)}"
+        lines = [section.name, f"wall time: {wall_time:.3f} s"]
+        if before is not None and after is not None:
+            stats = after.compare_to(before, "lineno")
+            lines.append(f"allocated: {sum(s.size_diff for s in stats) / 1e6:+.2f} MB")
+            lines.append(f"traced memory: {tracemalloc.get_traced_memory()[0] / 1e6:.2f} MB")
+            lines.append("")
+            lines.append(f"top {TOP_ALLOCATIONS} allocations by line:")
+            lines.extend(str(stat) for stat in stats[:TOP_ALLOCATIONS])
+        else:
+            lines.append("allocations: not traced")
+        if section.busy:
+            lines.append("cProfile: another profiler was active, calls are incomplete")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if section.profiled:
+                section.profile.dump_stats(self.directory / f"{stem}.pstats")
+            (self.directory / f"{stem}.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        except OSError:
+            # Profiling must never break the code it observes
+            pass
+
+
+class ProfileSection:
+    """One profiled piece of work; the profiler can be paused while other sections run."""
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.profiled = False
+        self.busy = False
+        self._directory = directory
+        self._active = False
+
+    def resume(self) -> None:
+        if self._active or self.busy:
+            return
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler per interpreter, e.g. a concurrent source has it
+            self.busy = True
+            return
+        self._active = self.profiled = True
+
+    def pause(self) -> None:
+        if self._active:
+            self.profile.disable()
+            self._active = False
+
+    @contextmanager
+    def running(self) -> Iterator[ProfileSection]:
+        with _joined_run(self._directory, self.name) as run:
+            before = _snapshot()
+            started = time.perf_counter()
+            self.resume()
+            try:
+                yield self
+            finally:
+                self.pause()
+                run.write(self, time.perf_counter() - started, before, _snapshot())
+
+    def wrap(self, stream: Iterator[T]) -> Iterator[T]:
+        """
+        Profiles the production of `stream`'s items. Pass the stage's input through paused(),
+        so that the upstream stages (profiled by their own sections) are not counted here.
+        """
+        with self.running():
+            while True:
+                self.resume()
+                try:
+                    item = next(stream)
+                except StopIteration:
+                    return
+                finally:
+                    self.pause()
+                yield item
+
+    def paused(self, items: Iterable[T]) -> Iterator[T]:
+        iterator = iter(items)
+        while True:
+            self.pause()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.resume()
+            yield item
+
+
+@contextmanager
+def _profiled_block(directory: Path, name: str) -> Iterator[ProfileSection]:
+    with ProfileSection(directory, name).running() as section:
+        yield section
+
+
+@contextmanager
+def _joined_run(directory: Path, label: str) -> Iterator[ProfileRun]:
+    global _run, _run_users
+    with _lock:
+        if _run is None:
+            _run = ProfileRun(directory, label)
+        run = _run
+        _run_users += 1
+    try:
+        yield run
+    finally:
+        with _lock:
+            _run_users -= 1
+            if _run_users == 0:
+                _run = None
+
+
+def _snapshot():
+    try:
+        snapshot = tracemalloc.take_snapshot()
+    except RuntimeError:
+        # Tracing was stopped (profiling disabled) while the section was open
+        return None
+    # Leave out the profilers' own bookkeeping
+    return snapshot.filter_traces(_OWN_ALLOCATIONS)
+
+
+_OWN_ALLOCATIONS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, cProfile.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+def _section_name(kind: str, subject: str | None) -> str:
+    return kind if subject is None else f"{kind} {subject}"
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")[:60] or "section"
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from .search_index import SearchIndex, normalize
+from .store import ServiceStore
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+ITEM_FIELDS = ("name", "price", "category", "source", "url")
+
+
+class Catalog:
+    """
+    One aggregation result prepared for queries: search index, category/source row lists and
+    rows ordered by price. Never changes after construction, a refresh builds a new Catalog.
+
+    `version` is a hash of the content, so an identical result (e.g. after a restart) keeps
+    the same ETags.
+    """
+
+    def __init__(self, store: ServiceStore, errors: Iterable[str] = ()) -> None:
+        self.store = store
+        self.errors = list(errors)
+        self.loaded_at = time.time()
+
+        self._index = SearchIndex()
+        self._index.add(store)
+        self._categories: dict[str, array] = {}
+        self._sources: dict[str, array] = {}
+        for row, (_, _, category, source, _) in enumerate(store.records()):
+            if category:
+                _add_row(self._categories, normalize(category), row)
+            _add_row(self._sources, normalize(source), row)
+        self.version = store.fingerprint()
+
+        prices = store.prices
+        self._price_rows = array("I", sorted(range(len(prices)), key=prices.__getitem__))
+        self._sorted_prices = array("d", (prices[row] for row in self._price_rows))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def query(
+        self,
+        text: str = "",
+        category: str | None = None,
+        source: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ) -> Sequence[int]:
+        """
+        Rows matching all given filters, in aggregation order. `text` is a substring search
+        (as in the main window), category and source must match exactly (case-insensitive).
+        """
+        row_sets: list[Sequence[int]] = []
+        if text:
+            row_sets.append(self._index.search(text))
+        if category is not None:
+            row_sets.append(self._categories.get(normalize(category), ()))
+        if source is not None:
+            row_sets.append(self._sources.get(normalize(source), ()))
+        has_price = min_price is not None or max_price is not None
+        low = float("-inf") if min_price is None else min_price
+        high = float("inf") if max_price is None else max_price
+
+        if not row_sets:
+            if not has_price:
+                return range(len(self.store))
+            # Only the price range: a slice of the price order
+            start = bisect_left(self._sorted_prices, low)
+            stop = bisect_right(self._sorted_prices, high)
+            return array("I", sorted(self._price_rows[start:stop]))
+
+        row_sets.sort(key=len)
+        rows: Iterable[int] = row_sets[0]
+        for other in row_sets[1:]:
+            members = set(other)
+            rows = [row for row in rows if row in members]
+        if has_price:
+            prices = self.store.prices
+            rows = [row for row in rows if low <= prices[row] <= high]
+        return rows
+
+    def page(self, rows: Sequence[int], offset: int, limit: int) -> list[dict[str, object]]:
+        return [dict(zip(ITEM_FIELDS, record)) for record in self.store.records(rows[offset:offset + limit])]
+
+    def meta(self) -> dict[str, object]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "total": len(self.store),
+            "categories": sorted(self.store.category(rows[0]) for rows in self._categories.values()),
+            "sources": sorted(self.store.source(rows[0]) for rows in self._sources.values()),
+            "errors": self.errors,
+        }
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    Read-only JSON API over a Catalog:
+
+        GET /items?q=масло&category=...&source=...&min_price=500&max_price=3000&offset=0&limit=100
+        GET /meta
+
+    Responses carry an ETag derived from the catalog version and the query, a request with a
+    matching If-None-Match gets 304 Not Modified without any filtering being done.
+    Replace `catalog` to publish a new aggregation result.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], catalog: Catalog) -> None:
+        super().__init__(address, QueryRequestHandler)
+        self.catalog = catalog
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    server: QueryServer
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        catalog = self.server.catalog
+        if url.path == "/items":
+            try:
+                params = _parse_items_query(url.query)
+            except ValueError as exc:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+                return
+            etag = _etag(catalog.version, repr(sorted(params.items())))
+            if self._not_modified(etag):
+                return
+            offset = params.pop("offset")
+            limit = params.pop("limit")
+            rows = catalog.query(**params)
+            body = {"total": len(rows), "offset": offset, "limit": limit, "items": catalog.page(rows, offset, limit)}
+            self._send_json(HTTPStatus.OK, body, etag)
+        elif url.path == "/meta":
+            etag = _etag(catalog.version, "meta")
+            if self._not_modified(etag):
+                return
+            self._send_json(HTTPStatus.OK, catalog.meta(), etag)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {url.path}"})
+
+    def _not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if header is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag not in tags and "*" not in tags:
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.end_headers()
+        return True
+
+    def _send_json(self, status: HTTPStatus, body: object, etag: str | None = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            # Clients may keep the response but have to revalidate it
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _parse_items_query(query: str) -> dict[str, object]:
+    values = {key: items[-1] for key, items in parse_qs(query).items()}
+    offset = _number(values, "offset", int)
+    limit = _number(values, "limit", int)
+    params: dict[str, object] = {
+        "text": values.get("q", ""),
+        "category": values.get("category"),
+        "source": values.get("source"),
+        "min_price": _number(values, "min_price", float),
+        "max_price": _number(values, "max_price", float),
+        # Only a missing value falls back to the default, limit=0 is out of range
+        "offset": 0 if offset is None else offset,
+        "limit": DEFAULT_PAGE_SIZE if limit is None else limit,
+    }
+    if params["offset"] < 0:
+        raise ValueError("offset must not be negative")
+    if not 0 < params["limit"] <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return params
+
+
+def _number(values: dict[str, str], key: str, kind: type) -> float | int | None:
+    value = values.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        raise ValueError(f"{key} must be a number") from None
+
+
+def _etag(version: str, query: str) -> str:
+    return '"' + version + "-" + hashlib.blake2b(query.encode("utf-8"), digest_size=8).hexdigest() + '"'
+
+
+def _add_row(values: dict[str, array], value: str, row: int) -> None:
+    rows = values.get(value)
+    if rows is None:
+        rows = values[value] = array("I")
+    rows.append(row)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from .aggregator import is_loading
+from .plugin_base import PluginBase
+
+# The planned interval is stretched or shortened by up to this fraction, so that sources
+# configured with the same interval do not hit their sites at the same moment
+REFRESH_JITTER = 0.1
+# Retry delay after the first failure; doubled with every further failure up to the maximum
+BACKOFF_BASE = 60.0
+BACKOFF_MAX = 6 * 3600.0
+# A due source whose previous load() is still running (given up on after a timeout) is
+# looked at again after this many seconds instead of being started a second time
+BUSY_RETRY = 5.0
+
+
+def refresh_interval(plugin: PluginBase) -> float | None:
+    """
+    Seconds between background refreshes of a source, None if it is refreshed manually only.
+
+    Taken from the "refresh_interval" setting (minutes) if the plugin declares one in its
+    settings_schema, otherwise from the refresh_interval metadata attribute.
+    """
+    minutes = plugin.settings.get("refresh_interval", plugin.refresh_interval)
+    try:
+        minutes = float(minutes)
+    except (TypeError, ValueError):
+        return None
+    return minutes * 60.0 if minutes > 0 else None
+
+
+@dataclass(slots=True)
+class _SourceState:
+    interval: float | None
+    due_at: float
+    failures: int = 0
+    running: bool = False
+
+
+class RefreshScheduler:
+    """
+    Keeps track of when every Source/Parser plugin is due for a refresh.
+
+    The scheduler does no loading itself: take_due() hands out the stale sources (and marks
+    them running, so a source is never handed out twice before it finished), the caller
+    loads them and reports back with finished(). A success plans the next refresh one
+    interval (with jitter) later, a failure retries after an exponentially growing delay.
+    A source is also held back while `busy(plugin)` says a load of it is still running:
+    finished() comes when the refresh ends, a load that timed out may run on well after that.
+    Sources are keyed by plugin ID; thread-safe.
+    """
+
+    def __init__(
+        self,
+        jitter: float = REFRESH_JITTER,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+        busy: Callable[[PluginBase], bool] = is_loading,
+        busy_retry: float = BUSY_RETRY,
+    ) -> None:
+        self._jitter = jitter
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._clock = clock
+        self._rng = rng
+        self._busy = busy
+        self._busy_retry = busy_retry
+        self._lock = threading.Lock()
+        self._plugins: dict[str, PluginBase] = {}
+        self._states: dict[str, _SourceState] = {}
+
+    def set_plugins(self, plugins: Iterable[PluginBase]) -> None:
+        """
+        Sets the sources to schedule. Known sources keep their state unless their interval
+        changed; new ones are due one interval from now (the initial load is up to the caller).
+        Call again after settings were changed.
+        """
+        now = self._clock()
+        with self._lock:
+            self._plugins = {
+                p.id: p for p in plugins if p.plugin_type in ("Source", "Parser")
+            }
+            states = {}
+            for pid, plugin in self._plugins.items():
+                interval = refresh_interval(plugin)
+                state = self._states.get(pid)
+                if state is None or state.interval != interval:
+                    running = state is not None and state.running
+                    state = _SourceState(interval, self._next_due(interval, now), running=running)
+                states[pid] = state
+            self._states = states
+
+    def take_due(self, now: float | None = None) -> list[PluginBase]:
+        """Sources whose refresh is due and that are not running or busy; they are marked running."""
+        now = self._clock() if now is None else now
+        due = []
+        with self._lock:
+            for pid, state in self._states.items():
+                if not state.running and state.due_at <= now and not self._busy(self._plugins[pid]):
+                    state.running = True
+                    due.append(self._plugins[pid])
+        return due
+
+    def take(self, plugins: Iterable[PluginBase]) -> list[PluginBase]:
+        """
+        Marks the given sources running regardless of their schedule (e.g. a manual refresh).
+        Returns the ones that were neither running nor busy.
+        """
+        taken = []
+        with self._lock:
+            for plugin in plugins:
+                state = self._states.get(plugin.id)
+                if state is not None and not state.running and not self._busy(plugin):
+                    state.running = True
+                    taken.append(plugin)
+        return taken
+
+    def finished(self, plugin: PluginBase, ok: bool, now: float | None = None) -> None:
+        """Reports the outcome of a refresh handed out by take_due() or take()."""
+        now = self._clock() if now is None else now
+        with self._lock:
+            state = self._states.get(plugin.id)
+            if state is None:
+                # Removed while it was running
+                return
+            state.running = False
+            if ok:
+                state.failures = 0
+                state.due_at = self._next_due(state.interval, now)
+            else:
+                state.failures += 1
+                if state.interval is not None:
+                    delay = min(self._backoff_base * 2 ** (state.failures - 1), self._backoff_max)
+                    state.due_at = now + self._jittered(delay)
+
+    def next_due_in(self, now: float | None = None) -> float | None:
+        """Seconds until the next source is due (0 if one is overdue), None if nothing is scheduled."""
+        now = self._clock() if now is None else now
+        pending = []
+        with self._lock:
+            for pid, state in self._states.items():
+                if state.running or state.interval is None:
+                    continue
+                due_at = state.due_at
+                if due_at <= now and self._busy(self._plugins[pid]):
+                    # Nothing reports the end of an abandoned load, poll for it
+                    due_at = now + self._busy_retry
+                pending.append(due_at)
+        if not pending:
+            return None
+        return max(0.0, min(pending) - now)
+
+    def _next_due(self, interval: float | None, now: float) -> float:
+        return now + self._jittered(interval) if interval is not None else float("inf")
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1.0 + self._jitter * (2.0 * self._rng() - 1.0))
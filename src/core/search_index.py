@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterable
+
+from .models import ServiceItem
+
+
+def normalize(text: str) -> str:
+    """Search form of a string: case-folded, with ё written as е."""
+    return text.casefold().replace("ё", "е")
+
+
+class SearchIndex:
+    """
+    Substring search over service name, category and source.
+
+    Names are split into words; every distinct word has a posting list of rows and the
+    vocabulary is indexed by trigrams. Each whitespace-separated fragment of a query is a
+    substring of some word, so the rows of the words containing the longest fragments give
+    a small candidate set that is then confirmed against the full name. Categories and
+    sources repeat a lot, so they are indexed by distinct value (value -> rows).
+    Row numbers are positions in the order items were added.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._names: list[str] = []
+        self._word_ids: dict[str, int] = {}
+        self._words: list[str] = []
+        self._word_rows: list[array] = []
+        self._word_grams: dict[str, array] = {}
+        self._categories: dict[str, array] = {}
+        self._sources: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, items: Iterable[ServiceItem]) -> None:
+        names = self._names
+        word_ids = self._word_ids
+        word_rows = self._word_rows
+        for item in items:
+            row = len(names)
+            name = normalize(item.name)
+            names.append(name)
+            for word in name.split():
+                word_id = word_ids.get(word)
+                if word_id is None:
+                    word_id = self._add_word(word)
+                rows = word_rows[word_id]
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+            if item.category:
+                _add_value(self._categories, normalize(item.category), row)
+            if item.source:
+                _add_value(self._sources, normalize(item.source), row)
+
+    def rebuild(self, items: Iterable[ServiceItem]) -> None:
+        self.clear()
+        self.add(items)
+
+    def search(self, query: str) -> array | None:
+        """Sorted rows containing `query` in any indexed field, or None for an empty query (all rows)."""
+        query = normalize(query)
+        if not query:
+            return None
+
+        names = self._names
+        fragments = sorted(query.split(), key=len, reverse=True)
+        if fragments and len(fragments[0]) >= 3:
+            candidates: set[int] | None = None
+            for fragment in fragments:
+                if len(fragment) < 3:
+                    break
+                rows = self._rows_with_fragment(fragment)
+                candidates = rows if candidates is None else candidates & rows
+                if not candidates:
+                    break
+            found = {row for row in candidates or () if query in names[row]}
+        else:
+            # Too short for trigrams
+            found = {row for row, name in enumerate(names) if query in name}
+
+        for values in (self._categories, self._sources):
+            for value, rows in values.items():
+                if query in value:
+                    found.update(rows)
+
+        return array("I", sorted(found))
+
+    def _add_word(self, word: str) -> int:
+        word_id = len(self._words)
+        self._words.append(word)
+        self._word_ids[word] = word_id
+        self._word_rows.append(array("I"))
+        grams = self._word_grams
+        for gram in {word[i:i + 3] for i in range(len(word) - 2)}:
+            ids = grams.get(gram)
+            if ids is None:
+                ids = grams[gram] = array("I")
+            ids.append(word_id)
+        return word_id
+
+    def _rows_with_fragment(self, fragment: str) -> set[int]:
+        """Rows whose name has a word containing `fragment` (at least three characters)."""
+        id_lists = []
+        for gram in {fragment[i:i + 3] for i in range(len(fragment) - 2)}:
+            ids = self._word_grams.get(gram)
+            if ids is None:
+                return set()
+            id_lists.append(ids)
+        id_lists.sort(key=len)
+        word_ids = set(id_lists[0])
+        for ids in id_lists[1:]:
+            word_ids.intersection_update(ids)
+
+        rows: set[int] = set()
+        words = self._words
+        for word_id in word_ids:
+            if fragment in words[word_id]:
+                rows.update(self._word_rows[word_id])
+        return rows
+
+
+def matches(item: ServiceItem, query: str) -> bool:
+    """Whether SearchIndex.search() would find `item` for an already normalized `query`."""
+    return (
+        query in normalize(item.name)
+        or bool(item.category) and query in normalize(item.category)
+        or bool(item.source) and query in normalize(item.source)
+    )
+
+
+def _add_value(values: dict[str, array], value: str, row: int) -> None:
+    rows = values.get(value)
+    if rows is None:
+        rows = values[value] = array("I")
+    rows.append(row)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+from array import array
+from typing import Iterable, Iterator, overload
+
+from .models import ServiceItem
+
+
+class _Dictionary:
+    """Dictionary encoding for repeated strings: value <-> small integer code (-1 is None)."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: str | None) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def decode(self, code: int) -> str | None:
+        return None if code < 0 else self.values[code]
+
+
+class ServiceStore:
+    """
+    Columnar storage for service rows.
+
+    Prices live in one contiguous float array, category/source/url are dictionary-encoded
+    integer codes and names are kept as UTF-8 in a single byte buffer with offsets.
+    Indexing returns lightweight ServiceRow views with the same attributes as ServiceItem,
+    so the store can be used wherever a list[ServiceItem] is read.
+    """
+
+    def __init__(self, items: Iterable[ServiceItem] | None = None) -> None:
+        self.prices = array("d")
+        self._name_data = bytearray()
+        self._name_offsets = array("Q", [0])
+        self._category_codes = array("i")
+        self._source_codes = array("i")
+        self._url_codes = array("i")
+        self._categories = _Dictionary()
+        self._sources = _Dictionary()
+        self._urls = _Dictionary()
+        if items is not None:
+            self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @overload
+    def __getitem__(self, row: int) -> ServiceRow: ...
+    @overload
+    def __getitem__(self, row: slice) -> list[ServiceRow]: ...
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [ServiceRow(self, i) for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("ServiceStore index out of range")
+        return ServiceRow(self, row)
+
+    def __iter__(self) -> Iterator[ServiceRow]:
+        for row in range(len(self)):
+            yield ServiceRow(self, row)
+
+    def append(self, item: ServiceItem) -> None:
+        encoded = item.name.encode("utf-8")
+        self._name_data += encoded
+        self._name_offsets.append(len(self._name_data))
+        self.prices.append(item.price)
+        self._category_codes.append(self._categories.encode(item.category))
+        self._source_codes.append(self._sources.encode(item.source))
+        self._url_codes.append(self._urls.encode(item.url))
+
+    def extend(self, items: Iterable[ServiceItem]) -> None:
+        append = self.append
+        for item in items:
+            append(item)
+
+    def __setitem__(self, row: int, item: ServiceItem) -> None:
+        """Replaces price, category, source and url of a row. The name of a row cannot change."""
+        if item.name != self.name(row):
+            raise ValueError("ServiceStore rows keep their name, remove and append the row instead")
+        self.prices[row] = item.price
+        self._category_codes[row] = self._categories.encode(item.category)
+        self._source_codes[row] = self._sources.encode(item.source)
+        self._url_codes[row] = self._urls.encode(item.url)
+
+    def __delitem__(self, rows: int | slice) -> None:
+        """Deletes one row or a contiguous range of rows (step 1)."""
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(len(self))
+            if step != 1:
+                raise ValueError("ServiceStore supports deleting contiguous ranges only")
+        else:
+            start = rows + len(self) if rows < 0 else rows
+            if not 0 <= start < len(self):
+                raise IndexError("ServiceStore index out of range")
+            stop = start + 1
+        if start >= stop:
+            return
+
+        offsets = self._name_offsets
+        name_start, name_stop = offsets[start], offsets[stop]
+        removed = name_stop - name_start
+        del self._name_data[name_start:name_stop]
+        tail = array("Q", (offset - removed for offset in offsets[stop + 1:]))
+        del offsets[start + 1:]
+        offsets.extend(tail)
+
+        del self.prices[start:stop]
+        del self._category_codes[start:stop]
+        del self._source_codes[start:stop]
+        del self._url_codes[start:stop]
+
+    def clear(self) -> None:
+        self.__init__()  # type: ignore[misc]
+
+    # Column accessors (no row view allocation)
+
+    def name(self, row: int) -> str:
+        start, end = self._name_offsets[row], self._name_offsets[row + 1]
+        return self._name_data[start:end].decode("utf-8")
+
+    def price(self, row: int) -> float:
+        return self.prices[row]
+
+    def category(self, row: int) -> str | None:
+        return self._categories.decode(self._category_codes[row])
+
+    def source(self, row: int) -> str:
+        return self._sources.decode(self._source_codes[row]) or ""
+
+    def url(self, row: int) -> str | None:
+        return self._urls.decode(self._url_codes[row])
+
+    def item(self, row: int) -> ServiceItem:
+        return ServiceItem.create(
+            name=self.name(row),
+            price=self.prices[row],
+            category=self.category(row),
+            source=self.source(row),
+            url=self.url(row),
+        )
+
+    def to_items(self) -> list[ServiceItem]:
+        return [self.item(row) for row in range(len(self))]
+
+    def fingerprint(self) -> str:
+        """Hash of the content. Stores filled with the same rows in the same order hash equally."""
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(self._name_offsets)
+        digest.update(self._name_data)
+        digest.update(self.prices)
+        for codes, dictionary in (
+            (self._category_codes, self._categories),
+            (self._source_codes, self._sources),
+            (self._url_codes, self._urls),
+        ):
+            # Codes only mean something together with the values they stand for
+            digest.update(codes)
+            digest.update("\0".join(dictionary.values).encode("utf-8"))
+            digest.update(b"\1")
+        return digest.hexdigest()
+
+    def records(self, rows: Iterable[int] | None = None) -> Iterator[tuple[str, float, str | None, str, str | None]]:
+        """
+        Yields (name, price, category, source, url) for `rows` (default: all rows in order),
+        reading the columns directly without creating items or row views.
+        """
+        name_data = self._name_data
+        offsets = self._name_offsets
+        prices = self.prices
+        category_codes, categories = self._category_codes, self._categories.values
+        source_codes, sources = self._source_codes, self._sources.values
+        url_codes, urls = self._url_codes, self._urls.values
+        for row in range(len(prices)) if rows is None else rows:
+            category = category_codes[row]
+            source = source_codes[row]
+            url = url_codes[row]
+            yield (
+                name_data[offsets[row]:offsets[row + 1]].decode("utf-8"),
+                prices[row],
+                None if category < 0 else categories[category],
+                "" if source < 0 else sources[source],
+                None if url < 0 else urls[url],
+            )
+
+
+class ServiceRow:
+    """Read-only view of one ServiceStore row, attribute-compatible with ServiceItem."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: ServiceStore, row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        return self._store.name(self._row)
+
+    @property
+    def price(self) -> float:
+        return self._store.prices[self._row]
+
+    @property
+    def category(self) -> str | None:
+        return self._store.category(self._row)
+
+    @property
+    def source(self) -> str:
+        return self._store.source(self._row)
+
+    @property
+    def url(self) -> str | None:
+        return self._store.url(self._row)
+
+    def to_item(self) -> ServiceItem:
+        return self._store.item(self._row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ServiceRow):
+            other = other.to_item()
+        if isinstance(other, ServiceItem):
+            return self.to_item() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.to_item())
+
+    def __repr__(self) -> str:
+        return f"ServiceRow({self._row}, {self.to_item()!r})"
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.metrics import PluginMetrics, write_metrics
+
+KIND_LABELS = {"source": "Источник", "processor": "Обработчик"}
+
+
+class DiagnosticsDialog(QDialog):
+    """Timings and counts per plugin from the latest refreshes, with JSON export."""
+
+    def __init__(
+        self,
+        metrics: list[PluginMetrics],
+        taken_at: float | None,
+        export_dir: Path,
+        parent: QWidget | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Диагностика обновления")
+        self.resize(900, 400)
+        self._metrics = metrics
+        self._taken_at = taken_at
+        self._export_dir = export_dir
+
+        layout = QVBoxLayout(self)
+        if not metrics:
+            layout.addWidget(QLabel("Данные ещё не обновлялись"))
+
+        self.table = QTableWidget(len(metrics), 8)
+        self.table.setHorizontalHeaderLabels(
+            ["Плагин", "Тип", "Время, с", "Первая запись, с", "Записей", "Отброшено", "Загружено, КБ", "Ошибка"]
+        )
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSortingEnabled(False)
+        for row, m in enumerate(metrics):
+            first = "" if m.first_item_time is None else f"{m.first_item_time:.3f}"
+            values = [
+                m.name,
+                KIND_LABELS.get(m.kind, m.kind),
+                f"{m.wall_time:.3f}",
+                first,
+                str(m.items),
+                str(m.rejected),
+                f"{m.bytes_fetched / 1024:.1f}",
+                m.exception or "",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if 2 <= column <= 6:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        export_btn = QPushButton("Экспорт в JSON...")
+        export_btn.setEnabled(bool(metrics))
+        export_btn.clicked.connect(self._export)
+        buttons.addWidget(export_btn)
+        close_btn = QPushButton("Закрыть")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+    def _export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт диагностики", str(self._export_dir / "refresh_metrics.json"), "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            write_metrics(Path(path), self._metrics, self._taken_at)
+        except OSError as exc:
+            QMessageBox.warning(self, "Ошибка экспорта", str(exc))
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from ui.proxy_model import FilterResult, SequentialHeaderProxyModel
+
+# Input that arrives faster than this is coalesced into one filter run
+FILTER_DELAY_MS = 200
+
+
+@dataclass(frozen=True, slots=True)
+class FilterRequest:
+    generation: int
+    search_text: str
+    min_price: float
+    max_price: float
+
+
+class FilterWorker(QObject):
+    """Computes filter results on the filtering thread (see FilterController)."""
+
+    finished = pyqtSignal(object, object)  # FilterRequest, FilterResult | None
+
+    def __init__(self, proxy: SequentialHeaderProxyModel) -> None:
+        super().__init__()
+        self._proxy = proxy
+        # Generation of the newest request, set by the controller
+        self.latest = 0
+
+    def compute(self, request: FilterRequest) -> None:
+        if request.generation != self.latest:
+            # A newer request is already queued behind this one
+            return
+        try:
+            result = self._proxy.compute_filter(request.search_text, request.min_price, request.max_price)
+        except (IndexError, RuntimeError, ValueError):
+            # The rows changed while the result was computed, the controller retries
+            result = None
+        self.finished.emit(request, result)
+
+
+class FilterController(QObject):
+    """
+    Debounced, off-thread filtering for the search box and the price spin boxes.
+
+    Input changes only restart a short timer. When it fires, the accepted rows for the latest
+    state are computed on a worker thread; results that a newer state has replaced are dropped
+    and only the final one is applied to the proxy on the GUI thread.
+    """
+
+    _compute = pyqtSignal(object)
+
+    def __init__(
+        self,
+        proxy: SequentialHeaderProxyModel,
+        delay_ms: int = FILTER_DELAY_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._proxy = proxy
+        self._search_text = ""
+        self._min_price = 0.0
+        self._max_price = 999999999.0
+        self._generation = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._submit)
+
+        self._thread = QThread(self)
+        self._worker = FilterWorker(proxy)
+        self._worker.moveToThread(self._thread)
+        self._compute.connect(self._worker.compute)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+
+    def set_search_text(self, text: str) -> None:
+        self._search_text = text
+        self._timer.start()
+
+    def set_min_price(self, price: float) -> None:
+        self._min_price = price
+        self._timer.start()
+
+    def set_max_price(self, price: float) -> None:
+        self._max_price = price
+        self._timer.start()
+
+    def shutdown(self) -> None:
+        self._timer.stop()
+        self._generation += 1
+        self._worker.latest = self._generation
+        self._thread.quit()
+        self._thread.wait()
+
+    def _submit(self) -> None:
+        self._generation += 1
+        self._worker.latest = self._generation
+        self._compute.emit(
+            FilterRequest(self._generation, self._search_text, self._min_price, self._max_price)
+        )
+
+    def _on_finished(self, request: FilterRequest, result: FilterResult | None) -> None:
+        if request.generation != self._generation:
+            return
+        if result is None or not self._proxy.apply_filter(result):
+            # Rows changed in the meantime (e.g. a refresh batch arrived), compute again
+            self._submit()
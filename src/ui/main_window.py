@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime
 from pathlib import Path
 
-from PyQt6.QtCore import QUrl, QModelIndex, Qt, QSortFilterProxyModel
+from PyQt6.QtCore import QUrl, QModelIndex, Qt, QSortFilterProxyModel, QThread, QTimer
 from PyQt6.QtGui import QAction, QDesktopServices
 from PyQt6.QtWidgets import (
+    QApplication,
     QDoubleSpinBox,
+    QFileDialog,
     QHBoxLayout,
     QHeaderView,
     QLabel,
@@ -20,12 +23,21 @@ from PyQt6.QtWidgets import (
     QInputDialog,
 )
 
-from core.aggregator import aggregate
-from core.plugin_loader import load_plugins
+from core.export import open_export
+from core.metrics import PluginMetrics
+from core.history import PriceHistory
+from core.http_cache import configure_default_cache
+from core.plugin_loader import PluginRegistry
+from core import profiling
+from core.scheduler import RefreshScheduler
 from core.license_manager import LicenseManager
+from core.store import ServiceStore
 from ui.table_model import ServiceTableModel
 from ui.plugin_dialog import PluginManagerDialog
+from ui.diagnostics_dialog import DiagnosticsDialog
+from ui.filter_controller import FilterController
 from ui.proxy_model import SequentialHeaderProxyModel
+from ui.refresh_worker import RefreshWorker
 
 
 class MainWindow(QMainWindow):
@@ -37,22 +49,52 @@ class MainWindow(QMainWindow):
         
         # Initialize License Manager
         self._license_manager = LicenseManager(self._data_dir)
+
+        # Parsers revalidate price pages against this cache instead of downloading them every refresh
+        configure_default_cache(self._data_dir / "http_cache")
+
+        # Every refresh is appended to the price history as a snapshot
+        self._history = PriceHistory(self._data_dir / "history.sqlite3")
+
+        # Profiling hooks stay off unless CARSERVICE_PROFILE is set or they are turned on in "Справка"
+        profiling.enable_from_environment(self._data_dir / "profiles")
         self.setWindowTitle("Агрегатор услуг автотехцентров")
 
         self.resize(1050, 650)
 
-        self._model = ServiceTableModel()
+        # Rows are kept in a columnar store to keep memory low on large catalogs
+        self._model = ServiceTableModel(ServiceStore())
         self._proxy_model = SequentialHeaderProxyModel()
         self._proxy_model.setSourceModel(self._model)
-        self._proxy_model.setSortRole(Qt.ItemDataRole.EditRole) # Use EditRole for sorting (allows numeric sort for prices)
-        self._proxy_model.setFilterKeyColumn(-1)
-        self._proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # Search and price inputs are debounced and filtered off the GUI thread
+        self._filter_controller = FilterController(self._proxy_model, parent=self)
         
         self._plugins = []
+        # Reloads only added/changed plugin files, unchanged ones keep their objects and settings.
+        # On startup plugins come from the manifest cache, their modules are imported on first use
+        self._plugin_registry = PluginRegistry(self._plugin_dir, self._data_dir / "plugin_manifest.json")
         # Store GUIDs of active processors in order
         self._active_chain_ids: list[str] = []
         self._plugin_errors: list[str] = []
 
+        # Background refresh state
+        self._refresh_thread: QThread | None = None
+        self._refresh_worker: RefreshWorker | None = None
+        self._refresh_errors: list[str] = []
+        self._refresh_sources: set[str] = set()
+        self._refresh_pending = False
+        # Sources loaded by the running refresh, None while it refreshes everything
+        self._refresh_plugins: list | None = None
+        # Latest metrics per (kind, plugin id); a scheduled refresh only replaces its own sources
+        self._metrics: dict[tuple[str, str], PluginMetrics] = {}
+        self._metrics_taken_at: float | None = None
+
+        # Sources with a refresh interval are refreshed in the background when they get stale
+        self._scheduler = RefreshScheduler()
+        self._schedule_timer = QTimer(self)
+        self._schedule_timer.setSingleShot(True)
+        self._schedule_timer.timeout.connect(self._refresh_due_sources)
+
         self._table = QTableView()
         self._table.setModel(self._proxy_model)
         self._table.setSortingEnabled(True)
@@ -155,20 +197,25 @@ class MainWindow(QMainWindow):
             self._license_status_label.setText(self._license_manager.get_status_text())
 
     def _on_search_text_changed(self, text: str) -> None:
-        self._proxy_model.setFilterRegularExpression(text)
+        self._filter_controller.set_search_text(text)
 
     def _on_min_price_changed(self, val: float) -> None:
-        self._proxy_model.setMinPrice(val)
+        self._filter_controller.set_min_price(val)
 
     def _on_max_price_changed(self, val: float) -> None:
         # If value is maximum configured range, treat as infinite? 
         # Or just use the value. 10 million is effectively infinite for car services.
-        self._proxy_model.setMaxPrice(val)
+        self._filter_controller.set_max_price(val)
 
 
     def _init_menu(self) -> None:
         # File Menu
         file_menu = self.menuBar().addMenu("Файл")
+        export_action = QAction("Экспорт...", self)
+        export_action.triggered.connect(self._export_data)
+        file_menu.addAction(export_action)
+        file_menu.addSeparator()
+
         exit_action = QAction("Выход", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -192,27 +239,75 @@ class MainWindow(QMainWindow):
         plugins_action.triggered.connect(self._open_plugin_manager)
         menu.addAction(plugins_action)
 
+        diagnostics_action = QAction("Диагностика обновления...", self)
+        diagnostics_action.triggered.connect(self._show_diagnostics)
+        menu.addAction(diagnostics_action)
+
         item_help = self.menuBar().addMenu("Справка")
         
         activate_action = QAction("Активация", self)
         activate_action.triggered.connect(self._show_activation_dialog)
         item_help.addAction(activate_action)
         
+        profiling_action = QAction("Профилирование", self)
+        profiling_action.setCheckable(True)
+        profiling_action.setChecked(profiling.is_enabled())
+        profiling_action.toggled.connect(self._set_profiling)
+        item_help.addAction(profiling_action)
+
         about_action = QAction("О приложении", self)
         about_action.triggered.connect(self._show_about_dialog)
         item_help.addAction(about_action)
 
     def _load_plugins(self) -> None:
-        self._plugins, self._plugin_errors = load_plugins(self._plugin_dir)
+        self._plugins, self._plugin_errors, report = self._plugin_registry.reload()
         status = f"Плагины: {len(self._plugins)}"
+        if report.unchanged or report.updated or report.removed:
+            # Not the first load: show how many plugin files were actually reloaded
+            status += f", изменено: {report.changed}"
         if self._plugin_errors:
             status += f", ошибки: {len(self._plugin_errors)}"
         self._status_label.setText(status)
 
+        self._scheduler.set_plugins(self._plugins)
+        self._schedule_next_refresh()
+
         if self._plugin_errors:
             QMessageBox.warning(self, "Ошибки загрузки", "\n".join(self._plugin_errors))
 
     def _refresh_data(self) -> None:
+        if self._refresh_thread is not None:
+            # A refresh is already running, restart once it is done (settings may have changed)
+            self._refresh_pending = True
+            return
+        # A source whose earlier load is still running (timed out) is left out this time
+        sources = [p for p in self._plugins if p.plugin_type in ("Source", "Parser")]
+        taken = self._scheduler.take(sources)
+        if sources and not taken:
+            self._status_label.setText("Источники ещё загружаются, обновление пропущено")
+            return
+        self._start_refresh(None if len(taken) == len(sources) else taken)
+
+    def _refresh_due_sources(self) -> None:
+        if self._refresh_thread is not None:
+            # Picked up again once the running refresh is finished
+            return
+        due = self._scheduler.take_due()
+        if due:
+            self._start_refresh(due)
+        else:
+            self._schedule_next_refresh()
+
+    def _schedule_next_refresh(self) -> None:
+        delay = self._scheduler.next_due_in()
+        if delay is None:
+            self._schedule_timer.stop()
+        else:
+            self._schedule_timer.start(int(min(delay, 24 * 3600) * 1000))
+
+    def _start_refresh(self, sources: list | None) -> None:
+        """Loads `sources` (all plugins if None) in the background and merges them into the table."""
+
         # Resolve chain objects
         processors = []
         for pid in self._active_chain_ids:
@@ -224,16 +319,125 @@ class MainWindow(QMainWindow):
              # Just a safety check if IDs outlived plugins
              pass
 
-        items, errors = aggregate(self._plugins, processors=processors)
-        self._model.set_items(items)
-        status = f"Услуг: {len(items)}"
+        # Sources are loaded in parallel in the background; every source is merged
+        # into the table as soon as it answers instead of waiting for the slowest one.
+        # Rows are diffed, not reset, so selection, scroll and sorting survive a refresh.
+        self._refresh_errors = []
+        self._refresh_sources = set()
+        self._refresh_plugins = sources
+        self._status_label.setText("Загрузка данных...")
+
+        self._refresh_thread = QThread(self)
+        self._refresh_worker = RefreshWorker(
+            self._plugins if sources is None else sources,
+            processors,
+            history=self._history,
+            partial=sources is not None,
+        )
+        self._refresh_worker.moveToThread(self._refresh_thread)
+        self._refresh_thread.started.connect(self._refresh_worker.run)
+        self._refresh_worker.batch_ready.connect(self._on_refresh_batch)
+        self._refresh_worker.finished.connect(self._on_refresh_finished)
+        self._refresh_thread.start()
+
+    def _on_refresh_batch(self, items: list, errors: list) -> None:
+        sources = {item.source for item in items}
+        self._refresh_sources |= sources
+        self._model.update_items(items, sources=sources)
+        self._refresh_errors.extend(errors)
+        self._status_label.setText(f"Загрузка данных... Услуг: {self._model.rowCount()}")
+
+    def _on_refresh_finished(self) -> None:
+        if self._refresh_thread is not None:
+            self._refresh_thread.quit()
+            self._refresh_thread.wait()
+            self._refresh_thread.deleteLater()
+        # Source plugin ID -> whether its load went through (it may have returned nothing)
+        loaded: dict[str, bool] = {}
+        if self._refresh_worker is not None:
+            for m in self._refresh_worker.metrics:
+                self._metrics[(m.kind, m.plugin_id)] = m
+                if m.kind == "source":
+                    loaded[m.plugin_id] = m.exception is None
+            self._metrics_taken_at = time.time()
+            self._refresh_worker.deleteLater()
+        self._refresh_thread = None
+        self._refresh_worker = None
+
+        # Sources that returned nothing this time (failed or emptied) drop their old rows.
+        # A scheduled refresh only covers its own sources, the others keep their rows
+        scheduled = self._refresh_plugins is not None
+        refreshed = self._refresh_plugins if scheduled else self._plugins
+        if scheduled:
+            stale = {p.name for p in refreshed} - self._refresh_sources
+        else:
+            stale = {item.source for item in self._model._items} - self._refresh_sources
+        if stale:
+            self._model.update_items([], sources=stale)
+
+        # A source whose load raised or timed out is retried with backoff
+        for plugin in refreshed:
+            if plugin.plugin_type in ("Source", "Parser"):
+                self._scheduler.finished(plugin, loaded.get(plugin.id, False))
+        self._refresh_plugins = None
+
+        errors = self._refresh_errors
+        status = f"Услуг: {self._model.rowCount()}"
         if errors:
             status += f", ошибки: {len(errors)}"
         self._status_label.setText(status)
 
-        if errors:
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh_data()
+            return
+        self._schedule_next_refresh()
+
+        # Background refreshes only report their errors in the status bar
+        if errors and not scheduled:
             QMessageBox.warning(self, "Ошибки обработки", "\n".join(errors))
 
+    def closeEvent(self, event) -> None:
+        # Let a running refresh finish (it is bounded by the aggregation deadlines)
+        self._refresh_pending = False
+        self._schedule_timer.stop()
+        if self._refresh_thread is not None:
+            self._refresh_thread.quit()
+            self._refresh_thread.wait()
+        self._filter_controller.shutdown()
+        self._history.close()
+        super().closeEvent(event)
+
+    def _export_data(self) -> None:
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Экспорт",
+            str(self._base_dir / "services.csv"),
+            "CSV (*.csv);;JSON Lines (*.jsonl)",
+        )
+        if not path:
+            return
+        path = Path(path)
+        if path.suffix.lower() not in (".csv", ".jsonl"):
+            path = path.with_name(path.name + (".jsonl" if "jsonl" in selected_filter else ".csv"))
+
+        # The visible rows in view order are streamed straight from the store to the file
+        items = self._model._items
+        rows = self._proxy_model.source_rows()
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            with open_export(path) as writer:
+                if isinstance(items, ServiceStore):
+                    writer.write_store(items, rows)
+                else:
+                    writer.write(items[row] for row in rows)
+        except OSError as exc:
+            QMessageBox.warning(self, "Ошибка экспорта", str(exc))
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        self._status_label.setText(f"Экспортировано услуг: {writer.count} в {path.name}")
+
     def _open_plugins_folder(self) -> None:
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(self._plugin_dir)))
         
@@ -267,11 +471,26 @@ class MainWindow(QMainWindow):
         if dialog.exec():
             # Apply new chain
             self._active_chain_ids = dialog.get_chain_result()
+            # Refresh intervals may have been changed in the plugin settings
+            self._scheduler.set_plugins(self._plugins)
             # Update UI state for plugin-dependent controls
             self._update_ui_state()
             # Auto-refresh to show changes
             self._refresh_data()
             
+    def _show_diagnostics(self) -> None:
+        dialog = DiagnosticsDialog(list(self._metrics.values()), self._metrics_taken_at, self._data_dir, self)
+        dialog.exec()
+
+    def _set_profiling(self, enabled: bool) -> None:
+        profiles_dir = self._data_dir / "profiles"
+        if enabled:
+            profiling.enable(profiles_dir)
+            self._status_label.setText(f"Профилирование включено, результаты в {profiles_dir}")
+        else:
+            profiling.disable()
+            self._status_label.setText("Профилирование выключено")
+
     def _show_about_dialog(self) -> None:
         text = (
             "Автор: Давыдов Андрей Васильевич\n"
@@ -1,59 +1,362 @@
-from PyQt6.QtCore import QSortFilterProxyModel, Qt, QModelIndex
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import compress
 
-class SequentialHeaderProxyModel(QSortFilterProxyModel):
+from PyQt6.QtCore import QAbstractProxyModel, Qt, QModelIndex
+
+from core.profiling import profiled
+from ui.table_model import _ranges
+
+
+@dataclass(slots=True)
+class FilterResult:
+    """Accepted rows for one filter state, see SequentialHeaderProxyModel.compute_filter()."""
+    revision: int
+    search_text: str
+    min_price: float
+    max_price: float
+    search_mask: bytearray | None
+    accepted: bytearray
+
+
+class SequentialHeaderProxyModel(QAbstractProxyModel):
     """
     A proxy model that ensures vertical headers (row numbers) are always sequential (1, 2, 3...),
     ignoring the underlying source row index.
-    Also supports filtering by price range (Min/Max).
+    Also supports filtering by price range (Min/Max) and by search text, and sorting by column
+    (using the sort permutations the model caches per column).
+
+    The source is a ServiceTableModel. The view is an array of source rows in display order,
+    so a filter change does not call back into Python per row: the price range is a slice of
+    the model's price sort order (binary search), intersected with the model's search mask.
+
+    A filter change is computed by compute_filter() and applied by apply_filter(); the first
+    may run on another thread (see FilterController), the second runs on the GUI thread.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._search_text = ""
         self._min_price = 0.0
         self._max_price = 999999999.0  # Large number as default max
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+        # Proxy row -> source row
+        self._rows = array("I")
+        # Source row -> proxy row (-1 if filtered out), built on demand and dropped when rows move
+        self._positions: array | None = None
+        # Inside a data_change_started/finished batch of the source the changed (first, last, left,
+        # right) ranges are collected; the relayout they need and dataChanged come once at the end
+        self._batching = False
+        self._relayout_pending = False
+        self._deferred_changes: list[tuple[int, int, int, int]] = []
+        # Bumped on every source change, a computed filter only applies to the same revision
+        self._revision = 0
+        self._connections = []
+        self._cell_data = None
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections = []
+        super().setSourceModel(model)
+        self._cell_data = model.cell_data if model is not None else None
+        if model is not None:
+            self._connections = [
+                (model.modelAboutToBeReset, self.beginResetModel),
+                (model.modelReset, self._on_source_reset),
+                (model.layoutAboutToBeChanged, self.beginResetModel),
+                (model.layoutChanged, self._on_source_reset),
+                (model.rowsAboutToBeRemoved, self._on_rows_about_to_be_removed),
+                (model.rowsRemoved, self._on_rows_removed),
+                (model.rowsInserted, self._on_rows_inserted),
+                (model.dataChanged, self._on_data_changed),
+            ]
+            if hasattr(model, "data_change_started"):
+                self._connections += [
+                    (model.data_change_started, self._on_data_change_started),
+                    (model.data_change_finished, self._on_data_change_finished),
+                ]
+            for signal, slot in self._connections:
+                signal.connect(slot)
+        self._drop_caches()
+        self._rows = self._view_rows()
+        self.endResetModel()
 
     def setMinPrice(self, price: float):
-        self._min_price = price
-        self.invalidateFilter()
+        self.apply_filter(self.compute_filter(self._search_text, price, self._max_price))
 
     def setMaxPrice(self, price: float):
-        self._max_price = price
-        self.invalidateFilter()
+        self.apply_filter(self.compute_filter(self._search_text, self._min_price, price))
 
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
-        # 1. Standard text filtering (regex)
-        if not super().filterAcceptsRow(source_row, source_parent):
-            return False
+    def setSearchText(self, text: str):
+        self.apply_filter(self.compute_filter(text, self._min_price, self._max_price))
 
-        # 2. Price filtering
-        model = self.sourceModel()
-        if not model:
-            return True
+    def compute_filter(self, search_text: str, min_price: float, max_price: float) -> FilterResult:
+        """
+        Computes the accepted source rows for a filter state without touching the view.
+        Safe to call outside the GUI thread; if the source changes meanwhile (or the rows change
+        under it and it raises), the result is stale and should be recomputed.
+        """
+        with profiled("filter"):
+            revision = self._revision
+            model = self.sourceModel()
+            search_mask = model.search_mask_for(search_text)
+            accepted = _accepted_rows(model, min_price, max_price, search_mask)
+            return FilterResult(revision, search_text, min_price, max_price, search_mask, accepted)
 
-        # Price is column 2
-        index = model.index(source_row, 2, source_parent)
-        # EditRole returns the raw float price
-        price_val = model.data(index, Qt.ItemDataRole.EditRole)
-
-        try:
-            price = float(price_val)
-        except (ValueError, TypeError):
-            # If price cannot be parsed, check if we're filtering strictly
-            # Usually safe to show if no strict filter, but hide if range is specific
-            # Let's hide non-numeric prices if we have a range set?
-            # Or treat as 0?
-            price = 0.0
-
-        if price < self._min_price:
-            return False
-        if price > self._max_price:
+    def apply_filter(self, result: FilterResult) -> bool:
+        """Shows the rows of `result`; returns False (and changes nothing) if the result is stale."""
+        if result.revision != self._revision:
             return False
-            
+        with profiled("filter apply"):
+            self._search_text = result.search_text
+            self._min_price = result.min_price
+            self._max_price = result.max_price
+            self.sourceModel().apply_search_mask(result.search_text, result.search_mask)
+            self._relayout(result.accepted)
         return True
 
+    def source_rows(self) -> array:
+        """Source rows of the view, in view order (filtered and sorted). Do not modify."""
+        return self._rows
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        if column == self._sort_column and column >= 0:
+            if order != self._sort_order:
+                # Same column, other direction: the view is simply reversed
+                self._sort_order = order
+                self._set_rows(self._rows[::-1])
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout()
+
+    # --- QAbstractProxyModel interface ---
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < len(self._rows)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, child: QModelIndex | None = None):
+        if child is None:
+            # QObject.parent()
+            return super().parent()
+        return QModelIndex()
+
+    def sibling(self, row: int, column: int, index: QModelIndex) -> QModelIndex:
+        return self.index(row, column)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        model = self.sourceModel()
+        return 0 if model is None or parent.isValid() else model.columnCount()
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and bool(self._rows)
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], proxy_index.column())
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        # Straight to the source row, mapToSource() would build and bounds-check a source index per call
+        if not index.isValid():
+            return None
+        return self._cell_data(self._rows[index.row()], index.column(), role)
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        position = self._positions_map()[source_index.row()]
+        if position < 0:
+            return QModelIndex()
+        return self.createIndex(position, source_index.column())
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
         # Override only vertical display role (row numbers)
         if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
             return str(section + 1)
-            
-        # For everything else (horizontal headers, other roles), pass to default implementation
-        return super().headerData(section, orientation, role)
+
+        model = self.sourceModel()
+        if orientation == Qt.Orientation.Horizontal and model is not None:
+            return model.headerData(section, orientation, role)
+        return None
+
+    # --- Filtering and sorting ---
+
+    def _accepts(self, source_row: int) -> bool:
+        """Checks a single source row against the filters (inserted or changed rows)."""
+        model = self.sourceModel()
+        if not model.accepts_search(source_row):
+            return False
+        return self._min_price <= model.price_at(source_row) <= self._max_price
+
+    def _view_rows(self, accepted: bytearray | None = None) -> array:
+        """Source rows that pass the filters (`accepted` if given), in display order."""
+        model = self.sourceModel()
+        if model is None:
+            return array("I")
+        if accepted is None:
+            accepted = _accepted_rows(model, self._min_price, self._max_price, model.search_mask())
+        if self._sort_column < 0:
+            return array("I", compress(range(len(accepted)), accepted))
+        order = model.sort_permutation(self._sort_column)
+        if self._sort_order == Qt.SortOrder.DescendingOrder:
+            order = order[::-1]
+        return array("I", compress(order, map(accepted.__getitem__, order)))
+
+    def _positions_map(self) -> array:
+        if self._positions is None:
+            positions = array("i", [-1]) * self.sourceModel().rowCount()
+            for position, row in enumerate(self._rows):
+                positions[row] = position
+            self._positions = positions
+        return self._positions
+
+    def _relayout(self, accepted: bytearray | None = None):
+        """Recomputes the view after a filter or sort change."""
+        self._set_rows(self._view_rows(accepted))
+
+    def _set_rows(self, rows: array):
+        """Replaces the view, keeping selection and current index on the same source rows."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [(self._rows[index.row()], index.column()) for index in persistent]
+        self._rows = rows
+        self._positions = None
+        if persistent:
+            positions = self._positions_map()
+            self.changePersistentIndexList(
+                persistent,
+                [self.createIndex(positions[row], column) if positions[row] >= 0 else QModelIndex()
+                 for row, column in sources],
+            )
+        self.layoutChanged.emit()
+
+    def _drop_caches(self):
+        self._revision += 1
+        self._positions = None
+
+    # --- Source model changes ---
+
+    def _on_source_reset(self):
+        self._drop_caches()
+        self._rows = self._view_rows()
+        self.endResetModel()
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int):
+        positions = self._positions_map()
+        removed = sorted(position for position in positions[first:last + 1] if position >= 0)
+        # Remove from the bottom so that earlier row numbers stay valid
+        for start, end in reversed(_ranges(removed)):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._rows[start:end + 1]
+            self.endRemoveRows()
+        self._positions = None
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        self._rows = array("I", [row - count if row > last else row for row in self._rows])
+        self._drop_caches()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        appended = first == self.sourceModel().rowCount() - count
+        if not appended:
+            self._rows = array("I", [row + count if row >= first else row for row in self._rows])
+        self._drop_caches()
+
+        if self._sort_column >= 0:
+            self._relayout()
+            return
+
+        # Unsorted view is in source order, so the new rows go in one block
+        inserted = [row for row in range(first, last + 1) if self._accepts(row)]
+        if not inserted:
+            return
+        position = bisect_left(self._rows, first)
+        self.beginInsertRows(QModelIndex(), position, position + len(inserted) - 1)
+        self._rows[position:position] = array("I", inserted)
+        self.endInsertRows()
+
+    def _on_data_change_started(self):
+        self._batching = True
+
+    def _on_data_change_finished(self):
+        self._batching = False
+        changes, self._deferred_changes = self._deferred_changes, []
+        if self._relayout_pending:
+            self._relayout_pending = False
+            self._relayout()
+        if changes:
+            self._emit_data_changed(changes)
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        left, right = top_left.column(), bottom_right.column()
+        # Rows changed in place do not move, so the positions stay valid; only computed filters go stale
+        self._revision += 1
+        relayout = self._relayout_pending or self._needs_relayout(first, last, left, right)
+        if self._batching:
+            self._relayout_pending = relayout
+            self._deferred_changes.append((first, last, left, right))
+            return
+        if relayout:
+            self._relayout()
+        self._emit_data_changed([(first, last, left, right)], roles)
+
+    def _needs_relayout(self, first: int, last: int, left: int, right: int) -> bool:
+        """True if changed source rows must move: sorted by a changed column, or the filter result flips."""
+        if left <= self._sort_column <= right:
+            return True
+        positions = self._positions_map()
+        return any((positions[row] >= 0) != self._accepts(row) for row in range(first, last + 1))
+
+    def _emit_data_changed(self, changes: list[tuple[int, int, int, int]], roles=()):
+        """
+        Emits one dataChanged spanning the visible rows of the changed source ranges. Views
+        handle every signal as a whole (header resizing to contents), not per row, so one
+        wide signal is far cheaper than one per scattered range.
+        """
+        positions = self._positions_map()
+        visible = [
+            positions[row] for first, last, _, _ in changes for row in range(first, last + 1) if positions[row] >= 0
+        ]
+        if not visible:
+            return
+        left = min(change[2] for change in changes)
+        right = max(change[3] for change in changes)
+        self.dataChanged.emit(self.index(min(visible), left), self.index(max(visible), right), roles)
+
+
+def _accepted_rows(model, min_price: float, max_price: float, search_mask: bytearray | None) -> bytearray:
+    """1/0 per source row for a price range (bisected over the model's price order) and search mask."""
+    price_rows = model.sort_permutation(2)
+    prices = model.prices()
+    count = len(price_rows)
+    if len(prices) != count:
+        raise ValueError("price order does not match the rows")
+    price_of = prices.__getitem__
+    first = bisect_left(price_rows, min_price, key=price_of)
+    last = bisect_right(price_rows, max_price, key=price_of)
+    if first == 0 and last == count:
+        accepted = bytearray(b"\x01") * count
+    else:
+        accepted = bytearray(count)
+        for row in price_rows[first:last]:
+            accepted[row] = 1
+
+    if search_mask is not None:
+        # Byte-wise AND of two 0/1 masks, done on whole integers instead of per row
+        if len(search_mask) != count:
+            raise ValueError("search mask does not match the price order")
+        both = int.from_bytes(accepted, "little") & int.from_bytes(search_mask, "little")
+        accepted = bytearray(both.to_bytes(count, "little"))
+    return accepted
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sqlite3
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.aggregator import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PLUGIN_TIMEOUT,
+    DEFAULT_TOTAL_TIMEOUT,
+    aggregate_stream,
+)
+from core.history import PriceHistory, SnapshotWriter
+from core.metrics import PluginMetrics
+from core.plugin_base import PluginBase
+from core.profiling import profile_run
+
+
+class RefreshWorker(QObject):
+    """
+    Runs aggregate_stream() outside the GUI thread (moved to a QThread)
+    and hands every finished source batch over to the GUI via signals.
+    With a PriceHistory given, the batches are also written as one snapshot once all are in;
+    a failing history is reported as an error, the batches reach the GUI regardless. A partial
+    refresh (some sources only) is recorded as a snapshot of just those sources.
+    Per-plugin metrics of the run are in `metrics` once `finished` has been emitted.
+    """
+
+    batch_ready = pyqtSignal(list, list)  # items, errors
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        plugins: list[PluginBase],
+        processors: list[PluginBase],
+        history: PriceHistory | None = None,
+        partial: bool = False,
+    ) -> None:
+        super().__init__()
+        self._plugins = list(plugins)
+        self._processors = list(processors)
+        self._history = history
+        self._partial = partial
+        self.metrics: list[PluginMetrics] = []
+
+    def run(self) -> None:
+        snapshot = None
+        if self._history is not None:
+            sources = None
+            if self._partial:
+                sources = [p.name for p in self._plugins if p.plugin_type in ("Source", "Parser")]
+            snapshot = self._history.snapshot(sources=sources)
+        try:
+            with profile_run("refresh"):
+                for items, errors in aggregate_stream(
+                    self._plugins,
+                    processors=self._processors,
+                    max_workers=DEFAULT_MAX_WORKERS,
+                    plugin_timeout=DEFAULT_PLUGIN_TIMEOUT,
+                    total_timeout=DEFAULT_TOTAL_TIMEOUT,
+                    metrics=self.metrics,
+                ):
+                    self.batch_ready.emit(items, errors)
+                    if snapshot is not None:
+                        snapshot.add(items)
+            if snapshot is not None:
+                self._write_snapshot(snapshot)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.batch_ready.emit([], [f"Aggregation failed: {exc}"])
+        finally:
+            self.finished.emit()
+
+    def _write_snapshot(self, snapshot: SnapshotWriter) -> None:
+        # The history is best-effort: a read-only, locked or full data dir must not cost the refresh
+        try:
+            snapshot.write()
+        except (sqlite3.Error, OSError) as exc:
+            self.batch_ready.emit([], [f"Price history: {exc}"])
@@ -1,18 +1,59 @@
 from __future__ import annotations
 
-from typing import Any
+import threading
+from array import array
+from itertools import chain, compress
+from operator import attrgetter
+from typing import Any, Iterable, Iterator, Sequence
 
-from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
 
 from core.models import ServiceItem
+from core.search_index import SearchIndex, matches, normalize
+from core.store import ServiceStore
+
+# Above this many separate removed ranges, update_items() compacts the rows and resets the model
+# once: every remove signal costs a pass over the rows in the store and in the proxy
+MAX_REMOVE_RANGES = 16
 
 
 class ServiceTableModel(QAbstractTableModel):
     headers = ["Услуга", "Категория", "Цена", "Источник"]
 
-    def __init__(self, items: list[ServiceItem] | None = None) -> None:
+    # update_items() brackets its dataChanged signals (one per changed range) with these, so a
+    # proxy can do the work that concerns the whole batch (re-sorting) once at the end
+    data_change_started = pyqtSignal()
+    data_change_finished = pyqtSignal()
+
+    def __init__(self, items: Sequence[ServiceItem] | ServiceStore | None = None) -> None:
         super().__init__()
-        self._items = items or []
+        # Either a plain list of ServiceItem or a columnar ServiceStore (rows are attribute-compatible)
+        self._items = items if items is not None else []
+        # Search over name/category/source, see set_search_text(). The index follows appends
+        # and is rebuilt on the next search after rows were removed or replaced.
+        # Searches may run on a filtering thread (see search_mask_for), so the lock covers the
+        # index together with the rows it is built from.
+        self._search_lock = threading.Lock()
+        self._search_index = SearchIndex()
+        self._search_stale = bool(self._items)
+        self._search_query = ""
+        self._search_mask: bytearray | None = None
+        # Column -> source rows in ascending order of that column and the sort keys of the
+        # rows, see sort_permutation(). Appended rows only extend them, price changes mark the
+        # price order for re-sorting and removals drop the orders. The price order is also the
+        # proxy's price filter index and may be asked for on the filtering thread, hence the lock.
+        self._sort_lock = threading.Lock()
+        self._sort_permutations: dict[int, array] = {}
+        self._sort_keys: dict[int, list[str]] = {}
+        self._sort_unsorted: set[int] = set()
+        # Display strings per row, filled when Qt first asks for the row (paint, autosize) and
+        # dropped together with the rows they belong to
+        self._display: list[tuple[str, str, str, str] | None] = [None] * len(self._items)
+        # Role -> handler(row, column), see cell_data()
+        self._role_handlers = {
+            Qt.ItemDataRole.DisplayRole: self._display_data,
+            Qt.ItemDataRole.EditRole: self._edit_data,
+        }
 
     def rowCount(self, parent: QModelIndex | None = None) -> int:  # type: ignore[override]
         return len(self._items)
@@ -23,32 +64,26 @@ class ServiceTableModel(QAbstractTableModel):
     def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # type: ignore[override]
         if not index.isValid():
             return None
+        return self.cell_data(index.row(), index.column(), role)
+
+    def cell_data(self, row: int, column: int, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """data() by row and column, without building a QModelIndex (used by the proxy)."""
+        # Qt asks for many roles per painted cell, the unused ones are rejected by one lookup
+        handler = self._role_handlers.get(role)
+        if handler is None:
+            return None
+        return handler(row, column)
+
+    def _display_data(self, row: int, column: int) -> str:
+        display = self._display[row]
+        if display is None:
+            item = self._items[row]
+            display = self._display[row] = (item.name, item.category or "-", f"{item.price:.2f}", item.source)
+        return display[column]
 
-        item = self._items[index.row()]
-        column = index.column()
-
-        if role == Qt.ItemDataRole.DisplayRole:
-            if column == 0:
-                return item.name
-            if column == 1:
-                return item.category or "-"
-            if column == 2:
-                return f"{item.price:.2f}"
-            if column == 3:
-                return item.source
-        
-        # EditRole is commonly used by QSortFilterProxyModel for sorting
-        elif role == Qt.ItemDataRole.EditRole:
-            if column == 0:
-                return item.name
-            if column == 1:
-                return item.category or ""
-            if column == 2:
-                return item.price  # Return raw float for numerical sorting
-            if column == 3:
-                return item.source
-
-        return None
+    def _edit_data(self, row: int, column: int) -> Any:
+        # Raw values (float price), as used for sorting and editing
+        return _EDIT_VALUES[column](self._items[row])
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:  # type: ignore[override]
         if role != Qt.ItemDataRole.DisplayRole:
@@ -57,7 +92,278 @@ class ServiceTableModel(QAbstractTableModel):
             return self.headers[section]
         return str(section + 1)
 
-    def set_items(self, items: list[ServiceItem]) -> None:
+    def price_at(self, row: int) -> float:
+        """Raw price of a source row without going through index()/data()."""
+        if isinstance(self._items, ServiceStore):
+            return self._items.prices[row]
+        return self._items[row].price
+
+    def prices(self) -> Sequence[float]:
+        """Raw prices of all source rows, in row order."""
+        if isinstance(self._items, ServiceStore):
+            return self._items.prices
+        return [item.price for item in self._items]
+
+    def sort_permutation(self, column: int) -> array:
+        """
+        Source rows in ascending order of `column`, cached until the rows change.
+        Names, categories and sources compare case-insensitively with ё as е (Russian
+        alphabetical order), prices numerically. Descending order is the reverse.
+        """
+        with self._sort_lock:
+            count = len(self._items)
+            permutation = self._sort_permutations.get(column)
+            if permutation is not None and len(permutation) == count and column not in self._sort_unsorted:
+                return permutation
+
+            keys = self._column_sort_keys(column)
+            if permutation is None:
+                order = range(count)
+            else:
+                # The previous order followed by the appended rows is nearly sorted,
+                # which sorted() merges in about linear time
+                order = chain(permutation, range(len(permutation), count))
+            permutation = array("I", sorted(order, key=keys.__getitem__))
+            self._sort_permutations[column] = permutation
+            self._sort_unsorted.discard(column)
+            return permutation
+
+    def _column_sort_keys(self, column: int) -> Sequence:
+        if column == 2:
+            return self.prices()
+        keys = self._sort_keys.setdefault(column, [])
+        items = self._items
+        start, stop = len(keys), len(items)
+        if start == stop:
+            return keys
+
+        if column == 0:
+            if isinstance(items, ServiceStore):
+                keys.extend(normalize(items.name(row)) for row in range(start, stop))
+            else:
+                keys.extend(normalize(items[row].name) for row in range(start, stop))
+            return keys
+
+        # Categories and sources repeat a lot, normalize every distinct value once
+        if isinstance(items, ServiceStore):
+            get_value = items.category if column == 1 else items.source
+            values = list(map(get_value, range(start, stop)))
+        else:
+            attribute = "category" if column == 1 else "source"
+            values = [getattr(items[row], attribute) for row in range(start, stop)]
+        normalized = {value: normalize(value or "") for value in set(values)}
+        keys.extend(normalized[value] for value in values)
+        return keys
+
+    def _reset_sort_orders(self) -> None:
+        with self._sort_lock:
+            self._sort_permutations.clear()
+            self._sort_keys.clear()
+            self._sort_unsorted.clear()
+
+    def set_search_text(self, text: str) -> None:
+        """Sets the search query (case-insensitive substring, ё = е) checked by accepts_search()."""
+        self.apply_search_mask(text, self.search_mask_for(text))
+
+    def search_mask_for(self, text: str) -> bytearray | None:
+        """
+        Computes the search mask for `text` without applying it (None for an empty query).
+        Safe to call outside the GUI thread; the result only fits the rows as they were.
+        """
+        query = normalize(text)
+        if not query:
+            return None
+        with self._search_lock:
+            if self._search_stale:
+                self._search_index.rebuild(self._items)
+                self._search_stale = False
+            rows = self._search_index.search(query)
+            mask = bytearray(len(self._search_index))
+        for row in rows:
+            mask[row] = 1
+        return mask
+
+    def apply_search_mask(self, text: str, mask: bytearray | None) -> None:
+        """Makes a mask from search_mask_for(text) current (GUI thread, rows unchanged since)."""
+        self._search_query = normalize(text)
+        self._search_mask = mask
+
+    def accepts_search(self, row: int) -> bool:
+        return self._search_mask is None or bool(self._search_mask[row])
+
+    def search_mask(self) -> bytearray | None:
+        """1/0 per source row for the current search, None when no search is set."""
+        return self._search_mask
+
+    def set_items(self, items: Sequence[ServiceItem] | ServiceStore) -> None:
         self.beginResetModel()
-        self._items = items
+        with self._search_lock:
+            self._items = items
+            self._search_stale = True
+        self._display = [None] * len(items)
+        self._update_search_mask()
+        self._reset_sort_orders()
         self.endResetModel()
+
+    def append_items(self, items: Sequence[ServiceItem]) -> None:
+        """Appends a batch without resetting the model (keeps selection, scroll and proxy mappings)."""
+        if not items:
+            return
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        with self._search_lock:
+            self._items.extend(items)
+            if not self._search_stale:
+                self._search_index.add(items)
+        self._display.extend([None] * len(items))
+        if self._search_mask is not None:
+            query = self._search_query
+            self._search_mask.extend(matches(item, query) for item in items)
+        self.endInsertRows()
+
+    def update_items(self, items: Iterable[ServiceItem], sources: Iterable[str] | None = None) -> None:
+        """
+        Brings the model to `items` with row-level changes instead of a model reset.
+
+        Rows are matched by (source, name, category). Matching rows stay where they are and
+        only emit dataChanged if their price or url changed, missing rows are removed and new
+        ones are appended. With `sources` given, only rows of those sources are compared, rows
+        of other sources are left untouched. Removals scattered over many ranges are done as
+        one model reset instead.
+        """
+        scope = set(sources) if sources is not None else None
+
+        # Key -> row of the rows in scope; identical keys are told apart by occurrence number
+        old_rows: dict[tuple, int] = {}
+        repeats: dict[tuple, int] = {}
+        for row, key in self._row_keys(scope):
+            if key in old_rows:
+                occurrence = repeats[key] = repeats.get(key, 0) + 1
+                key += (occurrence,)
+            old_rows[key] = row
+
+        store = self._items if isinstance(self._items, ServiceStore) else None
+        changed: list[int] = []
+        appended: list[ServiceItem] = []
+        seen: set[tuple] = set()
+        repeats = {}
+        for item in items:
+            key = (item.source, item.name, item.category)
+            if key in seen:
+                occurrence = repeats[key] = repeats.get(key, 0) + 1
+                key += (occurrence,)
+            else:
+                seen.add(key)
+            # Matched rows are taken out, the ones left over are removed below
+            row = old_rows.pop(key, None)
+            if row is None:
+                appended.append(item)
+                continue
+            if store is not None:
+                # Straight from the columns, a row view per row would cost more than the compare
+                differs = store.prices[row] != item.price or store.url(row) != item.url
+            else:
+                old = self._items[row]
+                differs = old.price != item.price or old.url != item.url
+            if differs:
+                self._items[row] = item
+                self._display[row] = None
+                changed.append(row)
+
+        if changed:
+            # Only prices (and urls) change in place, other sort orders and columns stay valid
+            with self._sort_lock:
+                self._sort_unsorted.add(2)
+            self.data_change_started.emit()
+            for first, last in _ranges(sorted(changed)):
+                self.dataChanged.emit(self.index(first, 2), self.index(last, 2))
+            self.data_change_finished.emit()
+
+        removed = sorted(old_rows.values())
+        removed_ranges = _ranges(removed)
+        if len(removed_ranges) > MAX_REMOVE_RANGES:
+            self.beginResetModel()
+            self._compact(removed)
+            self.endResetModel()
+            removed_ranges = []
+
+        # Remove from the bottom so that earlier row numbers stay valid
+        for first, last in reversed(removed_ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            with self._search_lock:
+                del self._items[first:last + 1]
+                self._search_stale = True
+            if self._search_mask is not None:
+                del self._search_mask[first:last + 1]
+            del self._display[first:last + 1]
+            with self._sort_lock:
+                for keys in self._sort_keys.values():
+                    del keys[first:last + 1]
+                self._sort_permutations.clear()
+            self.endRemoveRows()
+
+        self.append_items(appended)
+
+    def _row_keys(self, scope: set[str] | None) -> Iterator[tuple[int, tuple]]:
+        """(row, (source, name, category)) of the rows of the `scope` sources (all if None)."""
+        items = self._items
+        if isinstance(items, ServiceStore):
+            keys = ((source, name, category) for name, _, category, source, _ in items.records())
+        else:
+            keys = ((item.source, item.name, item.category) for item in items)
+        if scope is None:
+            return enumerate(keys)
+        return ((row, key) for row, key in enumerate(keys) if key[0] in scope)
+
+    def clear(self) -> None:
+        # Keep the container type (list or ServiceStore) the model was created with
+        self.beginResetModel()
+        with self._search_lock:
+            self._items.clear()
+            self._search_index.clear()
+            self._search_stale = False
+        self._display = []
+        self._update_search_mask()
+        self._reset_sort_orders()
+        self.endResetModel()
+
+    def _compact(self, removed: list[int]) -> None:
+        """Drops `removed` rows in one pass over the rows (see MAX_REMOVE_RANGES)."""
+        keep = bytearray(b"\x01") * len(self._items)
+        for row in removed:
+            keep[row] = 0
+        with self._search_lock:
+            if isinstance(self._items, ServiceStore):
+                # Row views refer to the store, so take the items out before clearing it
+                remaining = [self._items.item(row) for row in compress(range(len(keep)), keep)]
+            else:
+                remaining = list(compress(self._items, keep))
+            self._items.clear()
+            self._items.extend(remaining)
+            self._search_stale = True
+        self._display = [None] * len(self._items)
+        if self._search_mask is not None:
+            self._search_mask = bytearray(compress(self._search_mask, keep))
+        self._reset_sort_orders()
+
+    def _update_search_mask(self) -> None:
+        self._search_mask = self.search_mask_for(self._search_query)
+
+
+_EDIT_VALUES = (
+    attrgetter("name"),
+    lambda item: item.category or "",
+    attrgetter("price"),
+    attrgetter("source"),
+)
+
+
+def _ranges(rows: list[int]) -> list[tuple[int, int]]:
+    """Groups sorted row numbers into contiguous (first, last) ranges."""
+    ranges: list[tuple[int, int]] = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+    return ranges
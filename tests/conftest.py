@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Same layout as app.py/cli.py: core.* and ui.* are imported from src
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    QtCore = pytest.importorskip("PyQt6.QtCore")
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+from core.history import PriceHistory
+from core.models import ServiceItem
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = PriceHistory(tmp_path / "history.sqlite3")
+    yield history
+    history.close()
+
+
+def listed(items) -> list[tuple[str, str, float]]:
+    return [(item.source, item.name, item.price) for item in items]
+
+
+def test_partial_snapshot_keeps_the_other_sources(history):
+    first = history.record_snapshot([ServiceItem("Мойка", 500.0, None, "A"), ServiceItem("Шины", 900.0, None, "B")])
+    second = history.record_snapshot([ServiceItem("Мойка", 600.0, None, "A")], sources=["A"])
+
+    assert listed(history.items()) == [("A", "Мойка", 600.0), ("B", "Шины", 900.0)]
+    assert listed(history.items(second)) == listed(history.items())
+    assert listed(history.items(first)) == [("A", "Мойка", 500.0), ("B", "Шины", 900.0)]
+
+    # A partial snapshot drops what its own sources no longer list
+    history.record_snapshot([], sources=["B"])
+    assert listed(history.items()) == [("A", "Мойка", 600.0)]
+    # A full snapshot covers every source
+    history.record_snapshot([ServiceItem("Шины", 900.0, None, "B")])
+    assert listed(history.items()) == [("B", "Шины", 900.0)]
+
+
+def test_snapshot_of_no_sources_is_not_written(history):
+    history.record_snapshot([ServiceItem("Мойка", 500.0, None, "A")])
+    assert history.record_snapshot([], sources=[]) == 0
+    assert len(history.snapshots()) == 1
+
+
+def catalog(wash: float = 500.0, tyres: float = 900.0) -> list[ServiceItem]:
+    return [
+        ServiceItem("Мойка", wash, "Уход", "A"),
+        ServiceItem("Шины", tyres, "Шиномонтаж", "A"),
+        ServiceItem("Мойка", wash + 100.0, "Уход", "B"),
+    ]
+
+
+def test_unchanged_rows_add_no_prices(history):
+    history.record_snapshot(catalog(), taken_at=1.0)
+    history.record_snapshot(catalog(), taken_at=2.0)
+    assert len(history.price_history()) == 3
+    assert [count for _, _, count in history.snapshots()] == [3, 3]
+
+
+def test_price_change_adds_one_point(history):
+    history.record_snapshot(catalog(), taken_at=1.0)
+    changed = catalog()
+    changed[0] = ServiceItem("Мойка", 550.0, "Уход", "A")
+    history.record_snapshot(changed, taken_at=2.0)
+
+    assert len(history.price_history()) == 4
+    wash = history.price_history(source="A", name="Мойка")
+    assert [(p.taken_at, p.price) for p in wash] == [(1.0, 500.0), (2.0, 550.0)]
+
+
+def test_service_listed_twice_keeps_the_lowest_price(history):
+    items = catalog() + [ServiceItem("Мойка", 450.0, "Уход", "A", "https://a.example/wash")]
+    history.record_snapshot(items)
+    (wash,) = history.price_history(source="A", name="Мойка")
+    assert wash.price == 450.0
+    assert [count for _, _, count in history.snapshots()] == [3]
+
+
+def test_items_of_a_past_snapshot_have_its_prices(history):
+    first = history.record_snapshot(catalog(), taken_at=1.0)
+    history.record_snapshot(catalog(wash=550.0)[:2], taken_at=2.0)
+
+    assert listed(history.items(first)) == [("A", "Мойка", 500.0), ("A", "Шины", 900.0), ("B", "Мойка", 600.0)]
+    # B's service was not listed any more
+    assert listed(history.items()) == [("A", "Мойка", 550.0), ("A", "Шины", 900.0)]
+    with pytest.raises(ValueError):
+        history.items(first + 10)
+
+
+def test_price_history_filters(history):
+    history.record_snapshot(catalog(), taken_at=1.0)
+    history.record_snapshot(catalog(wash=550.0, tyres=950.0), taken_at=2.0)
+
+    assert {p.source for p in history.price_history(source="B")} == {"B"}
+    assert {p.name for p in history.price_history(category="Шиномонтаж")} == {"Шины"}
+    assert len(history.price_history(name="Мойка")) == 4
+    assert {p.taken_at for p in history.price_history(since=2.0)} == {2.0}
+    assert {p.taken_at for p in history.price_history(until=1.0)} == {1.0}
+    assert len(history.price_history(limit=2)) == 2
+    # Ordered by service, then time
+    points = history.price_history(source="A", category="Уход")
+    assert [(p.name, p.taken_at) for p in points] == [("Мойка", 1.0), ("Мойка", 2.0)]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.http_cache import HttpCache
+from core.http_client import HttpClient
+
+PAGE = "<html>цены</html>".encode("utf-8")
+
+
+class PriceServer(ThreadingHTTPServer):
+    """Serves PAGE with the headers of `self.headers`, answering If-None-Match with 304."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.headers: dict[str, str] = {"ETag": '"v1"'}
+        self.requests: list[dict[str, str]] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/price"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PriceServer
+
+    def do_GET(self) -> None:
+        self.server.requests.append(dict(self.headers))
+        etag = self.server.headers.get("ETag")
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        for key, value in self.server.headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    server = PriceServer()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = HttpClient(cache=HttpCache(tmp_path / "cache"))
+    yield client
+    client.close()
+
+
+def test_stale_entry_is_revalidated_with_etag(server, client):
+    first = client.get(server.url)
+    assert first.status_code == 200
+    assert first.content == PAGE
+    assert client.cache.lookup(server.url).etag == '"v1"'
+
+    second = client.get(server.url)
+    assert second.status_code == 200
+    assert second.content == PAGE
+    assert second.from_cache
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert len(server.requests) == 2
+
+
+def test_changed_page_replaces_the_entry(server, client):
+    client.get(server.url)
+    server.headers = {"ETag": '"v2"'}
+    response = client.get(server.url)
+    assert not getattr(response, "from_cache", False)
+    assert client.cache.lookup(server.url).etag == '"v2"'
+
+
+def test_fresh_entry_is_served_without_a_request(server, client):
+    server.headers = {"Cache-Control": "max-age=60"}
+    client.get(server.url)
+    response = client.get(server.url)
+    assert response.from_cache
+    assert response.content == PAGE
+    assert len(server.requests) == 1
+
+
+def test_expired_max_age_goes_to_the_network(server, client):
+    server.headers = {"Cache-Control": "max-age=60", "ETag": '"v1"'}
+    client.get(server.url)
+    client.cache.lookup(server.url).stored_at -= 61
+    client.get(server.url)
+    assert len(server.requests) == 2
+    # The 304 makes the entry fresh again
+    client.get(server.url)
+    assert len(server.requests) == 2
+
+
+def test_no_store_and_unvalidated_responses_are_not_cached(server, client):
+    server.headers = {"Cache-Control": "no-store", "ETag": '"v1"'}
+    client.get(server.url)
+    assert client.cache.lookup(server.url) is None
+    server.headers = {}
+    client.get(server.url)
+    assert client.cache.lookup(server.url) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=25)
+    for name in ("a", "b"):
+        cache.store(f"http://x/{name}", b"0123456789", {"ETag": name})
+        time.sleep(0.01)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.read_body(cache.lookup("http://x/a")) == b"0123456789"
+    time.sleep(0.01)
+    cache.store("http://x/c", b"0123456789", {"ETag": "c"})
+
+    assert cache.lookup("http://x/b") is None
+    assert cache.lookup("http://x/a") is not None
+    assert cache.lookup("http://x/c") is not None
+    assert cache.total_bytes == 20
+    assert sorted(p.name for p in tmp_path.glob("*.body")) == sorted(
+        cache.lookup(url).file for url in ("http://x/a", "http://x/c")
+    )
+
+
+def test_index_survives_a_restart(tmp_path):
+    HttpCache(tmp_path).store("http://x/a", b"body", {"ETag": '"a"', "Cache-Control": "max-age=60"})
+    entry = HttpCache(tmp_path).lookup("http://x/a")
+    assert entry is not None
+    assert entry.etag == '"a"'
+    assert entry.is_fresh(time.time())
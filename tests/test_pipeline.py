@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from core.metrics import PluginMetrics
+from core.models import ServiceItem
+from core.pipeline import run_chain
+from core.plugin_base import PluginBase
+
+
+def make_items(count: int) -> list[ServiceItem]:
+    return [ServiceItem(f"Услуга {i}", float(i), None, "S") for i in range(count)]
+
+
+class Processor(PluginBase):
+    plugin_type = "Processor"
+
+    def __init__(self, name: str, process) -> None:
+        super().__init__()
+        self.id = name
+        self.name = name
+        self._process = process
+
+    def process(self, items):
+        return self._process(items)
+
+
+def doubling(items):
+    for item in items:
+        yield ServiceItem.create(item.name, item.price * 2, item.category, item.source)
+
+
+def failing_after(count: int):
+    def process(items):
+        for position, item in enumerate(items):
+            if position == count:
+                raise RuntimeError("boom")
+            yield item
+    return process
+
+
+def test_stages_run_in_order():
+    adding = Processor("add", lambda items: (ServiceItem.create(i.name, i.price + 1, None, i.source) for i in items))
+    result = list(run_chain(make_items(3), [adding, Processor("double", doubling)], []))
+    assert [item.price for item in result] == [2.0, 4.0, 6.0]
+
+
+def test_chain_is_lazy():
+    read = []
+
+    def source():
+        for item in make_items(5):
+            read.append(item)
+            yield item
+
+    stream = run_chain(source(), [Processor("double", doubling)], [])
+    next(stream)
+    assert len(read) == 1
+
+
+def test_failing_stage_passes_its_input_on_and_reports_the_error():
+    errors: list[str] = []
+    items = make_items(5)
+    result = list(run_chain(items, [Processor("broken", failing_after(2))], errors))
+    assert result == items
+    assert errors == ["Processor broken: boom"]
+
+
+def test_processor_failing_at_once_is_a_pass_through():
+    def broken(items):
+        raise ValueError("bad settings")
+
+    errors: list[str] = []
+    items = make_items(3)
+    result = list(run_chain(items, [Processor("broken", broken), Processor("double", doubling)], errors))
+    assert [item.price for item in result] == [0.0, 2.0, 4.0]
+    assert errors == ["Processor broken: bad settings"]
+
+
+def test_items_read_but_not_answered_for_are_kept():
+    def batching(items):
+        # Reads two items per output item, then fails with one item in flight
+        items = iter(items)
+        first = next(items)
+        next(items)
+        yield first
+        next(items)
+        raise RuntimeError("boom")
+
+    errors: list[str] = []
+    items = make_items(5)
+    result = list(run_chain(items, [Processor("batching", batching)], errors))
+    # The dropped second item stays dropped, the in-flight third one and the rest go on
+    assert result == [items[0], items[2], items[3], items[4]]
+    assert errors == ["Processor batching: boom"]
+
+
+def test_metrics_count_items_and_failures():
+    records = [PluginMetrics("broken", "broken", "processor"), PluginMetrics("double", "double", "processor")]
+    errors: list[str] = []
+    stages = [Processor("broken", failing_after(2)), Processor("double", doubling)]
+    result = list(run_chain(make_items(4), stages, errors, records))
+
+    assert len(result) == 4
+    broken, double = records
+    assert broken.items == 4
+    assert broken.rejected == 0
+    assert broken.exception == "RuntimeError"
+    assert double.items == 4
+    assert double.exception is None
+    assert double.first_item_time is not None
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from core import plugin_loader
+from core.plugin_loader import LazyPlugin, PluginRegistry, load_plugins
+
+SOURCE = '''
+from core.plugin_base import PluginBase
+from core.models import ServiceItem
+
+
+class Plugin(PluginBase):
+    id = "{id}"
+    name = "{name}"
+    plugin_type = "Source"
+    version = "{version}"
+    settings_schema = {schema}
+
+    def load(self):
+        return [ServiceItem("Замена масла", float(self.settings["price"]), None, self.name)]
+'''
+
+PRICE = {"price": {"type": "int", "label": "Цена", "default": 100}}
+ID_A = "11111111-1111-1111-1111-111111111111"
+ID_B = "22222222-2222-2222-2222-222222222222"
+
+
+def write_plugin(
+    path: Path, plugin_id: str = ID_A, name: str = "A", version: str = "1.0", schema: dict | None = None
+) -> None:
+    path.write_text(
+        SOURCE.format(id=plugin_id, name=name, version=version, schema=repr(PRICE if schema is None else schema)),
+        encoding="utf-8",
+    )
+    _bump_mtime(path)
+
+
+def _bump_mtime(path: Path) -> None:
+    # Rewrites within one timestamp tick must still look modified
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_first_reload_loads_all_plugins(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    write_plugin(tmp_path / "b.py", ID_B, "B")
+    (tmp_path / "_helper.py").write_text("raise RuntimeError('not a plugin')", encoding="utf-8")
+
+    plugins, errors, report = PluginRegistry(tmp_path).reload()
+    assert errors == []
+    assert [p.name for p in plugins] == ["A", "B"]
+    assert sorted(report.added) == ["a.py", "b.py"]
+    assert report.changed == 2
+
+
+def test_unchanged_files_keep_their_instances(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    registry = PluginRegistry(tmp_path)
+    (first,), _, _ = registry.reload()
+    first.update_settings({"price": 500})
+
+    (second,), errors, report = registry.reload()
+    assert second is first
+    assert errors == []
+    assert report.unchanged == ["a.py"]
+    assert report.changed == 0
+
+
+def test_updated_file_gets_the_previous_settings(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    registry = PluginRegistry(tmp_path)
+    (old,), _, _ = registry.reload()
+    old.update_settings({"price": 500})
+
+    write_plugin(tmp_path / "a.py", version="1.1")
+    (new,), errors, report = registry.reload()
+    assert errors == []
+    assert report.updated == ["a.py"]
+    assert new is not old
+    assert new.version == "1.1"
+    assert new.settings["price"] == 500
+    assert [item.price for item in new.load()] == [500.0]
+
+
+def test_settings_with_a_changed_schema_entry_are_not_carried(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    registry = PluginRegistry(tmp_path)
+    (old,), _, _ = registry.reload()
+    old.update_settings({"price": 500})
+
+    schema = {"price": {"type": "int", "label": "Цена, руб.", "default": 200}}
+    write_plugin(tmp_path / "a.py", version="1.1", schema=schema)
+    (new,), _, _ = registry.reload()
+    assert new.settings["price"] == 200
+
+
+def test_broken_update_keeps_the_previous_instance(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    registry = PluginRegistry(tmp_path)
+    (old,), _, _ = registry.reload()
+    old.update_settings({"price": 500})
+
+    (tmp_path / "a.py").write_text("this is not python", encoding="utf-8")
+    _bump_mtime(tmp_path / "a.py")
+    plugins, errors, report = registry.reload()
+    assert plugins == [old]
+    assert old.settings["price"] == 500
+    assert len(errors) == 1 and errors[0].startswith("a.py:")
+    assert report.updated == []
+
+    # Fixing the file replaces the instance again
+    write_plugin(tmp_path / "a.py", version="1.2")
+    (fixed,), errors, report = registry.reload()
+    assert errors == []
+    assert fixed.version == "1.2"
+    assert fixed.settings["price"] == 500
+
+
+def test_removed_files_and_duplicate_ids(tmp_path):
+    write_plugin(tmp_path / "a.py")
+    write_plugin(tmp_path / "b.py", ID_B, "B")
+    registry = PluginRegistry(tmp_path)
+    registry.reload()
+
+    (tmp_path / "b.py").unlink()
+    write_plugin(tmp_path / "c.py", ID_A, "Copy of A")
+    plugins, errors, report = registry.reload()
+    assert [p.name for p in plugins] == ["A"]
+    assert report.removed == ["b.py"]
+    assert len(errors) == 1 and "Duplicate Plugin ID" in errors[0]
+
+
+def test_manifest_defers_imports_until_first_use(tmp_path):
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    manifest = tmp_path / "manifest.json"
+    write_plugin(plugin_dir / "a.py")
+
+    (imported,), errors = load_plugins(plugin_dir, manifest)
+    assert errors == []
+    assert not isinstance(imported, LazyPlugin)
+    assert manifest.exists()
+
+    (lazy,), errors = load_plugins(plugin_dir, manifest)
+    assert errors == []
+    assert isinstance(lazy, LazyPlugin)
+    assert not lazy.is_loaded
+    assert (lazy.id, lazy.name, lazy.version) == (ID_A, "A", "1.0")
+    lazy.update_settings({"price": 300})
+    assert [item.price for item in lazy.load()] == [300.0]
+    assert lazy.is_loaded
+
+
+def test_manifest_hits_do_not_read_the_files(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    manifest = tmp_path / "manifest.json"
+    write_plugin(plugin_dir / "a.py")
+    write_plugin(plugin_dir / "b.py", ID_B, "B")
+    load_plugins(plugin_dir, manifest)
+
+    hashed: list[str] = []
+    file_hash = plugin_loader._file_hash
+    monkeypatch.setattr(plugin_loader, "_file_hash", lambda path: hashed.append(path.name) or file_hash(path))
+    registry = PluginRegistry(plugin_dir, manifest)
+    plugins, errors, _ = registry.reload()
+    assert errors == []
+    assert all(isinstance(p, LazyPlugin) for p in plugins)
+    assert hashed == []
+
+    # A touched but unchanged file is recognized by the hash taken from the manifest
+    _bump_mtime(plugin_dir / "a.py")
+    _, _, report = registry.reload()
+    assert report.unchanged == ["a.py", "b.py"]
+    assert hashed == ["a.py"]
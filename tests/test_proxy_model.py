@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QPersistentModelIndex, Qt  # noqa: E402
+
+from core.models import ServiceItem  # noqa: E402
+from core.store import ServiceStore  # noqa: E402
+from ui.proxy_model import SequentialHeaderProxyModel  # noqa: E402
+from ui.table_model import ServiceTableModel  # noqa: E402
+
+ROWS = 20_000
+
+
+def make_items(count: int) -> list[ServiceItem]:
+    return [ServiceItem(f"Услуга {i}", float(i % 997), None, f"S{i % 3}") for i in range(count)]
+
+
+def scattered_price_changes(items: list[ServiceItem]) -> list[ServiceItem]:
+    # Every 100th row gets a new price: 1% of the rows in as many separate ranges
+    return [
+        ServiceItem(item.name, item.price + 500.0, item.category, item.source) if row % 100 == 0 else item
+        for row, item in enumerate(items)
+    ]
+
+
+@pytest.fixture
+def models(qapp, monkeypatch):
+    model = ServiceTableModel(ServiceStore(make_items(ROWS)))
+    proxy = SequentialHeaderProxyModel()
+    proxy.setSourceModel(model)
+
+    counts = {"positions": 0, "layouts": 0}
+    positions_map = SequentialHeaderProxyModel._positions_map
+
+    def counting_positions_map(self):
+        if self._positions is None:
+            counts["positions"] += 1
+        return positions_map(self)
+
+    monkeypatch.setattr(SequentialHeaderProxyModel, "_positions_map", counting_positions_map)
+    proxy.layoutChanged.connect(lambda *args: counts.__setitem__("layouts", counts["layouts"] + 1))
+    return model, proxy, counts
+
+
+def view_prices(model, proxy) -> list[float]:
+    return [model.price_at(row) for row in proxy.source_rows()]
+
+
+def test_scattered_price_changes_unsorted_do_not_rebuild_the_view(models):
+    model, proxy, counts = models
+    proxy.mapFromSource(model.index(0, 0))
+    changed = []
+    proxy.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append((top_left, bottom_right)))
+
+    model.update_items(scattered_price_changes(model._items.to_items()))
+    assert counts == {"positions": 1, "layouts": 0}
+    assert proxy.rowCount() == ROWS
+    # One signal for the whole batch: a view handles every dataChanged as a whole (header autosize)
+    assert [(top_left.row(), bottom_right.row(), top_left.column()) for top_left, bottom_right in changed] == [
+        (0, ROWS - 100, 2)
+    ]
+
+
+def test_scattered_price_changes_sorted_by_price_relayout_once(models):
+    model, proxy, counts = models
+    proxy.sort(2, Qt.SortOrder.AscendingOrder)
+    counts.update(positions=0, layouts=0)
+
+    model.update_items(scattered_price_changes(model._items.to_items()))
+    assert counts["layouts"] == 1
+    assert counts["positions"] <= 2
+    prices = view_prices(model, proxy)
+    assert prices == sorted(prices)
+
+
+def test_sorted_by_another_column_keeps_the_layout(models):
+    model, proxy, counts = models
+    proxy.sort(0, Qt.SortOrder.AscendingOrder)
+    counts.update(positions=0, layouts=0)
+
+    model.update_items(scattered_price_changes(model._items.to_items()))
+    assert counts["layouts"] == 0
+
+
+def test_price_change_across_the_filter_shows_and_hides_rows(models):
+    model, proxy, counts = models
+    proxy.setMinPrice(0.0)
+    proxy.setMaxPrice(100.0)
+    visible = proxy.rowCount()
+    items = model._items.to_items()
+    counts.update(positions=0, layouts=0)
+
+    # Row 0 (price 0) leaves the range, row 500 (price 500) enters it
+    items[0] = ServiceItem(items[0].name, 900.0, None, items[0].source)
+    items[500] = ServiceItem(items[500].name, 50.0, None, items[500].source)
+    model.update_items(items)
+    assert counts["layouts"] == 1
+    assert proxy.rowCount() == visible
+    rows = set(proxy.source_rows())
+    assert 0 not in rows and 500 in rows
+    assert all(0.0 <= price <= 100.0 for price in view_prices(model, proxy))
+
+
+def test_selection_follows_the_rows_when_resorted(models):
+    model, proxy, _ = models
+    proxy.sort(2, Qt.SortOrder.AscendingOrder)
+    source_row = proxy.source_rows()[10]
+    persistent = QPersistentModelIndex(proxy.index(10, 0))
+    items = model._items.to_items()
+    items[source_row] = ServiceItem(items[source_row].name, 5000.0, None, items[source_row].source)
+    model.update_items(items)
+
+    assert persistent.isValid()
+    assert proxy.source_rows()[persistent.row()] == source_row
+    assert persistent.row() == proxy.rowCount() - 1
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.models import ServiceItem
+from core.query_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Catalog, QueryServer
+from core.store import ServiceStore
+
+ITEMS = [
+    ServiceItem("Замена масла", 1500.0, "ТО", "Auto-Motul", "https://a/1"),
+    ServiceItem("Замена масла АКПП", 4500.0, "ТО", "Magic Car 24", "https://m/1"),
+    ServiceItem("Шиномонтаж R15", 2000.0, "Шины", "Auto-Motul", None),
+    ServiceItem("Диагностика", 800.0, None, "Magic Car 24", None),
+]
+
+
+@pytest.fixture
+def server():
+    server = QueryServer(("127.0.0.1", 0), Catalog(ServiceStore(ITEMS), ["Source X: timeout"]))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    host, port = server.server_address[:2]
+    request = urllib.request.Request(f"http://{host}:{port}{path}", headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            body = response.read()
+            return response.status, response.headers, json.loads(body) if body else None
+    except urllib.error.HTTPError as exc:
+        body = exc.read()
+        return exc.code, exc.headers, json.loads(body) if body else None
+
+
+def names(body):
+    return [item["name"] for item in body["items"]]
+
+
+def test_items_without_filters_returns_everything_in_order(server):
+    status, _, body = get(server, "/items")
+    assert status == 200
+    assert body["total"] == 4
+    assert body["offset"] == 0
+    assert body["limit"] == DEFAULT_PAGE_SIZE
+    assert names(body) == [item.name for item in ITEMS]
+    assert body["items"][0] == {
+        "name": "Замена масла", "price": 1500.0, "category": "ТО", "source": "Auto-Motul", "url": "https://a/1",
+    }
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("q=%D0%BC%D0%B0%D1%81%D0%BB", ["Замена масла", "Замена масла АКПП"]),  # q=масл
+        ("source=auto-motul", ["Замена масла", "Шиномонтаж R15"]),
+        ("category=%D1%82%D0%BE&max_price=2000", ["Замена масла"]),  # category=то
+        ("min_price=1000&max_price=3000", ["Замена масла", "Шиномонтаж R15"]),
+        ("q=%D0%BC%D0%B0%D1%81%D0%BB&source=Magic%20Car%2024", ["Замена масла АКПП"]),
+        ("category=missing", []),
+    ],
+)
+def test_items_filters(server, query, expected):
+    status, _, body = get(server, f"/items?{query}")
+    assert status == 200
+    assert names(body) == expected
+    assert body["total"] == len(expected)
+
+
+def test_items_pagination(server):
+    _, _, first = get(server, "/items?limit=3")
+    _, _, second = get(server, "/items?offset=3&limit=3")
+    assert first["total"] == second["total"] == 4
+    assert names(first) + names(second) == [item.name for item in ITEMS]
+    _, _, past_end = get(server, "/items?offset=10")
+    assert past_end["items"] == []
+
+
+def test_meta(server):
+    status, headers, body = get(server, "/meta")
+    assert status == 200
+    assert body["total"] == 4
+    assert body["categories"] == ["ТО", "Шины"]
+    assert body["sources"] == ["Auto-Motul", "Magic Car 24"]
+    assert body["errors"] == ["Source X: timeout"]
+    assert body["version"] == server.catalog.version
+    assert headers["ETag"]
+
+
+def test_etag_revalidation(server):
+    _, headers, _ = get(server, "/items?q=%D0%BC%D0%B0%D1%81%D0%BB")
+    etag = headers["ETag"]
+    assert headers["Cache-Control"] == "no-cache"
+
+    status, headers, body = get(server, "/items?q=%D0%BC%D0%B0%D1%81%D0%BB", {"If-None-Match": etag})
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert body is None
+
+    # Another query or another catalog version does not match
+    status, _, _ = get(server, "/items?q=x", {"If-None-Match": etag})
+    assert status == 200
+    server.catalog = Catalog(ServiceStore(ITEMS[:2]))
+    status, headers, _ = get(server, "/items?q=%D0%BC%D0%B0%D1%81%D0%BB", {"If-None-Match": etag})
+    assert status == 200
+    assert headers["ETag"] != etag
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["limit=0", "limit=-1", f"limit={MAX_PAGE_SIZE + 1}", "limit=ten", "offset=-1", "offset=1.5", "min_price=cheap"],
+)
+def test_bad_parameters(server, query):
+    status, _, body = get(server, f"/items?{query}")
+    assert status == 400
+    assert body["error"]
+
+
+def test_unknown_path(server):
+    status, _, _ = get(server, "/nothing")
+    assert status == 404
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core.aggregator import aggregate, is_loading
+from core.models import ServiceItem
+from core.plugin_base import PluginBase
+from core.scheduler import RefreshScheduler
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Source(PluginBase):
+    plugin_type = "Source"
+
+    def __init__(self, name: str, minutes: float | None = 1) -> None:
+        super().__init__()
+        self.id = name
+        self.name = name
+        self.refresh_interval = minutes
+
+    def load(self):
+        return [ServiceItem("Замена масла", 100.0, None, self.name)]
+
+
+def make_scheduler(clock: Clock, rng=lambda: 0.5, busy=lambda plugin: False, **kwargs) -> RefreshScheduler:
+    return RefreshScheduler(clock=clock, rng=rng, busy=busy, **kwargs)
+
+
+def test_sources_are_due_one_interval_after_set_plugins():
+    clock = Clock()
+    scheduler = make_scheduler(clock)
+    source, manual = Source("A"), Source("B", minutes=None)
+    scheduler.set_plugins([source, manual])
+
+    assert scheduler.next_due_in() == 60.0
+    assert scheduler.take_due() == []
+    clock.now += 60
+    assert scheduler.take_due() == [source]
+    # Handed out once until finished() is called
+    assert scheduler.take_due() == []
+
+    scheduler.finished(source, ok=True)
+    assert scheduler.next_due_in() == 60.0
+
+
+def test_jitter_stays_within_its_fraction():
+    clock = Clock()
+    for value, expected in ((0.0, 54.0), (0.5, 60.0), (1.0, 66.0)):
+        scheduler = make_scheduler(clock, rng=lambda: value, jitter=0.1)
+        scheduler.set_plugins([Source("A")])
+        assert scheduler.next_due_in() == pytest.approx(expected)
+
+
+def test_failures_back_off_exponentially_up_to_the_maximum():
+    clock = Clock()
+    scheduler = make_scheduler(clock, backoff_base=10.0, backoff_max=50.0)
+    source = Source("A")
+    scheduler.set_plugins([source])
+
+    delays = []
+    for _ in range(5):
+        clock.now += scheduler.next_due_in()
+        assert scheduler.take_due() == [source]
+        scheduler.finished(source, ok=False)
+        delays.append(scheduler.next_due_in())
+    assert delays == [10.0, 20.0, 40.0, 50.0, 50.0]
+
+    # A success goes back to the regular interval
+    clock.now += delays[-1]
+    scheduler.take_due()
+    scheduler.finished(source, ok=True)
+    assert scheduler.next_due_in() == 60.0
+
+
+def test_set_plugins_keeps_the_state_of_known_sources():
+    clock = Clock()
+    scheduler = make_scheduler(clock)
+    source = Source("A")
+    scheduler.set_plugins([source])
+    clock.now += 60
+    assert scheduler.take_due() == [source]
+
+    scheduler.set_plugins([source, Source("B")])
+    assert scheduler.take_due() == []
+    assert scheduler.take([source]) == []
+
+    # A changed interval plans the source anew
+    source.refresh_interval = 5
+    scheduler.set_plugins([source])
+    scheduler.finished(source, ok=True)
+    assert scheduler.next_due_in() == 300.0
+
+
+def test_busy_source_is_not_started_again():
+    clock = Clock()
+    loading: set[str] = set()
+    scheduler = make_scheduler(clock, busy=lambda plugin: plugin.id in loading, busy_retry=5.0)
+    source = Source("A")
+    scheduler.set_plugins([source])
+    clock.now += 60
+    assert scheduler.take_due() == [source]
+
+    # The refresh gave up on the load (timeout) but its thread goes on
+    loading.add("A")
+    scheduler.finished(source, ok=False)
+    clock.now += scheduler.next_due_in()
+    assert scheduler.take_due() == []
+    assert scheduler.next_due_in() == 5.0
+
+    # Nor by a manual refresh
+    assert scheduler.take([source]) == []
+
+    loading.clear()
+    clock.now += 5
+    assert scheduler.take_due() == [source]
+
+
+def test_timed_out_load_stays_busy_until_it_returns():
+    release = threading.Event()
+
+    class Hanging(Source):
+        def load(self):
+            release.wait(5)
+            return super().load()
+
+    source = Hanging("A")
+    items, errors = aggregate([source], max_workers=2, plugin_timeout=0.05)
+    assert items == []
+    assert errors == ["A: timed out after 0.05 s"]
+    assert is_loading(source)
+
+    clock = Clock()
+    scheduler = RefreshScheduler(clock=clock, jitter=0.0)
+    scheduler.set_plugins([source])
+    clock.now += 60
+    assert scheduler.take_due() == []
+
+    release.set()
+    for _ in range(500):
+        if not is_loading(source):
+            break
+        time.sleep(0.01)
+    assert scheduler.take_due() == [source]
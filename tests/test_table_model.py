@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QItemSelectionModel  # noqa: E402
+
+from core.models import ServiceItem  # noqa: E402
+from core.store import ServiceStore  # noqa: E402
+from ui.proxy_model import SequentialHeaderProxyModel  # noqa: E402
+from ui.table_model import MAX_REMOVE_RANGES, ServiceTableModel  # noqa: E402
+
+
+def item(name: str, price: float, source: str = "A", category: str | None = "ТО") -> ServiceItem:
+    return ServiceItem(name, price, category, source)
+
+
+def rows(model: ServiceTableModel) -> list[tuple[str, str, float]]:
+    return [(row.source, row.name, row.price) for row in model._items]
+
+
+@pytest.fixture(params=["list", "store"])
+def make_model(request, qapp):
+    def make(items: list[ServiceItem]) -> tuple[ServiceTableModel, list[tuple]]:
+        model = ServiceTableModel(list(items) if request.param == "list" else ServiceStore(items))
+        signals: list[tuple] = []
+        model.dataChanged.connect(lambda top_left, bottom_right, roles: signals.append(
+            ("changed", top_left.row(), bottom_right.row())
+        ))
+        model.rowsRemoved.connect(lambda parent, first, last: signals.append(("removed", first, last)))
+        model.rowsInserted.connect(lambda parent, first, last: signals.append(("inserted", first, last)))
+        model.modelReset.connect(lambda: signals.append(("reset",)))
+        return model, signals
+    return make
+
+
+def test_unchanged_refresh_emits_nothing(make_model):
+    items = [item(f"Услуга {i}", 100.0 + i) for i in range(5)]
+    model, signals = make_model(items)
+    model.update_items(list(items))
+    assert signals == []
+
+
+def test_changed_removed_and_new_rows(make_model):
+    model, signals = make_model([item("Мойка", 500.0), item("Шины", 900.0), item("Диагностика", 1200.0)])
+    model.update_items([item("Мойка", 550.0), item("Диагностика", 1200.0), item("Полировка", 3000.0)])
+
+    assert rows(model) == [("A", "Мойка", 550.0), ("A", "Диагностика", 1200.0), ("A", "Полировка", 3000.0)]
+    assert signals == [("changed", 0, 0), ("removed", 1, 1), ("inserted", 2, 2)]
+
+
+def test_duplicate_keys_are_matched_by_occurrence(make_model):
+    model, signals = make_model([item("Мойка", 500.0), item("Мойка", 700.0), item("Шины", 900.0)])
+
+    # The second "Мойка" changes, the first one stays
+    model.update_items([item("Мойка", 500.0), item("Мойка", 750.0), item("Шины", 900.0)])
+    assert rows(model) == [("A", "Мойка", 500.0), ("A", "Мойка", 750.0), ("A", "Шины", 900.0)]
+    assert signals == [("changed", 1, 1)]
+
+    # One occurrence fewer: the last one goes
+    signals.clear()
+    model.update_items([item("Мойка", 500.0), item("Шины", 900.0)])
+    assert rows(model) == [("A", "Мойка", 500.0), ("A", "Шины", 900.0)]
+    assert signals == [("removed", 1, 1)]
+
+    # A category is part of the key
+    signals.clear()
+    model.update_items([item("Мойка", 500.0), item("Мойка", 500.0, category=None), item("Шины", 900.0)])
+    assert signals == [("inserted", 2, 2)]
+
+
+def test_scope_leaves_other_sources_alone(make_model):
+    model, signals = make_model([item("Мойка", 500.0, "A"), item("Мойка", 600.0, "B"), item("Шины", 900.0, "A")])
+    model.update_items([item("Мойка", 550.0, "A")], sources=["A"])
+
+    assert rows(model) == [("A", "Мойка", 550.0), ("B", "Мойка", 600.0)]
+    assert signals == [("changed", 0, 0), ("removed", 2, 2)]
+
+    signals.clear()
+    model.update_items([], sources=["B"])
+    assert rows(model) == [("A", "Мойка", 550.0)]
+    assert signals == [("removed", 1, 1)]
+
+
+def test_scattered_removals_up_to_the_limit_remove_ranges(make_model):
+    count = 4 * MAX_REMOVE_RANGES
+    items = [item(f"Услуга {i}", float(i)) for i in range(count)]
+    model, signals = make_model(items)
+
+    # Every fourth row goes: MAX_REMOVE_RANGES separate ranges, removed from the bottom
+    kept = [it for i, it in enumerate(items) if i % 4]
+    model.update_items(kept)
+    assert rows(model) == [(it.source, it.name, it.price) for it in kept]
+    assert [signal[0] for signal in signals] == ["removed"] * MAX_REMOVE_RANGES
+    assert signals[0] == ("removed", count - 4, count - 4)
+    assert signals[-1] == ("removed", 0, 0)
+
+
+def test_removals_over_the_limit_compact_in_one_reset(make_model):
+    count = 4 * (MAX_REMOVE_RANGES + 1)
+    items = [item(f"Услуга {i}", float(i)) for i in range(count)]
+    model, signals = make_model(items)
+
+    kept = [it for i, it in enumerate(items) if i % 4]
+    changed = [item(kept[0].name, 1000.0)] + kept[1:] + [item("Новая", 0.5)]
+    model.update_items(changed)
+    assert rows(model) == [(it.source, it.name, it.price) for it in changed]
+    assert signals == [("changed", 1, 1), ("reset",), ("inserted", len(kept), len(kept))]
+
+    # Search and sort caches follow the compacted rows
+    model.set_search_text("новая")
+    assert model.search_mask()[len(kept)] == 1
+    assert list(model.sort_permutation(2))[0] == len(kept)
+
+
+def test_selection_stays_on_the_same_services(make_model):
+    items = [item(f"Услуга {i}", float(i)) for i in range(10)]
+    model, _ = make_model(items)
+    proxy = SequentialHeaderProxyModel()
+    proxy.setSourceModel(model)
+    selection = QItemSelectionModel(proxy)
+    flags = QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+    for row in (3, 7):
+        selection.select(proxy.index(row, 0), flags)
+    selection.setCurrentIndex(proxy.index(7, 0), QItemSelectionModel.SelectionFlag.NoUpdate)
+
+    # Rows 1 and 5 go, row 7 changes its price, one row is added
+    refreshed = [it for i, it in enumerate(items) if i not in (1, 5)]
+    refreshed[5] = item("Услуга 7", 70.0)
+    model.update_items(refreshed + [item("Новая", 1.0)])
+
+    selected = sorted(model._items[proxy.mapToSource(index).row()].name for index in selection.selectedRows())
+    assert selected == ["Услуга 3", "Услуга 7"]
+    current = model._items[proxy.mapToSource(selection.currentIndex()).row()]
+    assert (current.name, current.price) == ("Услуга 7", 70.0)